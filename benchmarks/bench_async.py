@@ -0,0 +1,69 @@
+"""Wall time of swo_async() against a local stub simulation server.
+
+The server answers each request with the sphere value of the received
+vector after --latency-ms, standing in for a simulation daemon.
+
+Usage:
+    python -m benchmarks.bench_async --latency-ms 20 --concurrency 1,4,16,32
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from sw_optimizer.async_swo import swo_async
+
+
+async def handle_request(reader, writer, latency):
+    while line := await reader.readline():
+        x = np.array(line.split(), dtype=float)
+        await asyncio.sleep(latency)
+        writer.write(f'{float(np.sum(x ** 2))!r}\n'.encode())
+        await writer.drain()
+    writer.close()
+
+
+def make_objective(port):
+    async def remote_sphere(x):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write((' '.join(map(repr, x.tolist())) + '\n').encode())
+            await writer.drain()
+            return float(await reader.readline())
+        finally:
+            writer.close()
+    return remote_sphere
+
+
+async def run(args):
+    latency = args.latency_ms / 1e3
+    server = await asyncio.start_server(lambda r, w: handle_request(r, w, latency), '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    objective = make_objective(port)
+
+    lb = [-512] * args.dim
+    ub = [512] * args.dim
+    print(f"{'concurrency':>11} {'wall s':>8} {'speedup':>8}")
+    baseline = None
+    async with server:
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            start = time.perf_counter()
+            await swo_async(args.agents, args.iters, ub, lb, args.dim, objective, seed=0, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{concurrency:>11} {elapsed:>8.2f} {baseline / elapsed:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark swo_async() against a local stub server.')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Server response latency, ms')
+    parser.add_argument('--concurrency', type=str, default='1,4,16,32', help='Comma-separated concurrency limits')
+    parser.add_argument('--agents', type=int, default=32, help='Population size')
+    parser.add_argument('--iters', type=int, default=5, help='Iterations per run')
+    parser.add_argument('--dim', type=int, default=10, help='Problem dimension')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Throughput of swo_batch() against looping independent swo() runs.
+
+For each --runs count, the same number of seeded runs is done three ways:
+one swo_batch() call, a loop of swo(engine="vectorized") and a loop of
+swo() with the default loop engine (timed on at most --loop-runs runs and
+scaled). Reported are wall seconds, run-iterations per second and the
+speedup of swo_batch() over each mode; median best scores show that the
+batched runs solve the problem equally well.
+
+Usage:
+    python -m benchmarks.bench_batched --runs 10,30,50 --dim 10 --tmax 300
+"""
+import argparse
+import time
+
+import numpy as np
+
+from sw_optimizer.batched import swo_batch
+from sw_optimizer.sw_optimizer import swo
+from test_functions.registry import get_function
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark batched multi-run SWO against looping swo().')
+    parser.add_argument('--function', type=str, default='rastrigin', help='Registered test function')
+    parser.add_argument('--dim', type=int, default=10, help='Problem dimension')
+    parser.add_argument('--runs', type=str, default='10,30,50', help='Comma-separated numbers of runs')
+    parser.add_argument('--agents', type=int, default=30, help='Population size')
+    parser.add_argument('--tmax', type=int, default=300, help='Iterations per run')
+    parser.add_argument('--loop-runs', type=int, default=5, help='Runs actually timed for the loop engine')
+    args = parser.parse_args()
+
+    spec = get_function(args.function)
+    fobj = spec.load(args.dim)
+    lb, ub = spec.bounds(args.dim)
+    options = {'max_stall': args.tmax + 1}
+
+    print(f"{args.function} (dim={args.dim}, agents={args.agents}, tmax={args.tmax})")
+    print(f"{'runs':>5} {'mode':>11} {'wall s':>8} {'run-it/s':>10} {'speedup':>8} {'median best':>12}")
+    for runs in (int(r) for r in args.runs.split(',')):
+        start = time.perf_counter()
+        results = swo_batch(runs, args.agents, args.tmax, ub, lb, args.dim, fobj, seed=0, **options)
+        batched = time.perf_counter() - start
+        rows = [('batched', batched, results)]
+
+        start = time.perf_counter()
+        results = [swo(args.agents, args.tmax, ub, lb, args.dim, fobj, engine='vectorized', seed=seed, **options)
+                   for seed in range(runs)]
+        rows.append(('vectorized', time.perf_counter() - start, results))
+
+        timed = min(runs, args.loop_runs)
+        start = time.perf_counter()
+        results = [swo(args.agents, args.tmax, ub, lb, args.dim, fobj, seed=seed, **options) for seed in range(timed)]
+        rows.append(('loop', (time.perf_counter() - start) * runs / timed, results))
+
+        for mode, wall, results in rows:
+            iterations = sum(len(r[2]) for r in results) * runs / len(results)
+            best = np.median([r[0] for r in results])
+            print(f"{runs:>5} {mode:>11} {wall:>8.2f} {iterations / wall:>10.0f} {wall / batched:>7.1f}x "
+                  f"{best:>12.4g}")
+
+
+if __name__ == '__main__':
+    main()
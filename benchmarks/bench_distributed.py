@@ -0,0 +1,101 @@
+"""Wall-clock scaling of swo() with distributed evaluation over localhost TCP workers.
+
+A Coordinator listens on localhost and --max-workers worker processes
+connect to it exactly as remote hosts would (python -m
+sw_optimizer.distributed). The objective burns --cost-ms of CPU per call;
+with --sleep it sleeps instead, which shows the dispatch scaling even on a
+machine with fewer cores than workers (as if the workers were other hosts).
+With --kill-one, one worker is killed halfway through the largest run;
+its chunk is re-dispatched and the table shows the failure.
+
+Usage:
+    python -m benchmarks.bench_distributed --max-workers 8 --cost-ms 10
+    python -m benchmarks.bench_distributed --max-workers 4 --kill-one
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from sw_optimizer.distributed import Coordinator, start_local_workers
+from sw_optimizer.sw_optimizer import swo
+
+
+class ExpensiveSphere:
+    """Sphere that burns cost_ms of CPU (or sleeps, sleep=True) per call.
+
+    Picklable, so the workers receive the cost too.
+    """
+
+    def __init__(self, cost_ms, sleep=False):
+        self.cost_ms = cost_ms
+        self.sleep = sleep
+        self.__name__ = 'expensive_sphere'
+
+    def __call__(self, x):
+        if self.sleep:
+            time.sleep(self.cost_ms / 1e3)
+            return np.sum(np.asarray(x) ** 2)
+        deadline = time.process_time() + self.cost_ms / 1e3
+        while time.process_time() < deadline:
+            pass
+        return np.sum(np.asarray(x) ** 2)
+
+
+def run(workers, fobj, args, kill_after=None):
+    with Coordinator(chunk_size=args.chunk_size) as coordinator:
+        processes = start_local_workers(coordinator, workers)
+        if kill_after is not None:
+            threading.Timer(kill_after, processes[0].kill).start()
+        lb, ub = [-512] * args.dim, [512] * args.dim
+        start = time.perf_counter()
+        *_, info = swo(args.agents, args.iters, ub, lb, args.dim, fobj, engine='vectorized', seed=0,
+                       coordinator=coordinator, full_output=True)
+        elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    return elapsed, info['workers']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark distributed evaluation of swo() over TCP workers.')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help='Largest worker count to try')
+    parser.add_argument('--cost-ms', type=float, default=10.0, help='CPU time per objective call, ms')
+    parser.add_argument('--agents', type=int, default=32, help='Population size')
+    parser.add_argument('--iters', type=int, default=5, help='Iterations per run')
+    parser.add_argument('--dim', type=int, default=10, help='Problem dimension')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Candidates per dispatched chunk')
+    parser.add_argument('--sleep', action='store_true', help='Spend the cost sleeping instead of computing')
+    parser.add_argument('--kill-one', action='store_true', help='Kill one worker halfway through the largest run')
+    args = parser.parse_args()
+    fobj = ExpensiveSphere(args.cost_ms, args.sleep)
+
+    lb, ub = [-512] * args.dim, [512] * args.dim
+    start = time.perf_counter()
+    swo(args.agents, args.iters, ub, lb, args.dim, fobj, engine='vectorized', seed=0)
+    serial = time.perf_counter() - start
+    print(f"{'workers':>8} {'wall s':>9} {'speedup':>9}")
+    print(f"{'serial':>8} {serial:>9.2f} {1.0:>8.2f}x")
+
+    counts = []
+    workers = 1
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    for workers in counts:
+        kill_after = serial / workers / 2 if args.kill_one and workers == counts[-1] and workers > 1 else None
+        elapsed, stats = run(workers, fobj, args, kill_after)
+        print(f"{workers:>8} {elapsed:>9.2f} {serial / elapsed:>8.2f}x")
+
+    print(f"\nPer-worker statistics of the {counts[-1]}-worker run:")
+    print(f"{'worker':>20} {'alive':>6} {'tasks':>6} {'evals':>6} {'evals/s':>8} {'busy s':>7} {'failed':>7}")
+    for s in stats:
+        rate = f"{s['evals_per_second']:.1f}" if s['evals_per_second'] is not None else '-'
+        print(f"{s['name']:>20} {str(s['alive']):>6} {s['tasks']:>6} {s['evaluations']:>6} {rate:>8} "
+              f"{s['busy']:>7.2f} {s['failures']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Iteration-time comparison of the loop and vectorized swo() engines.
+
+Usage:
+    python -m benchmarks.bench_engines --dims 2,10,100,1000 --iters 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import swo
+from test_functions.sphere import sphere
+
+
+def time_per_iteration(engine, dim, agents, iters, repeats):
+    lb = [-512] * dim
+    ub = [512] * dim
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _, _, curve, _, _ = swo(agents, iters, ub, lb, dim, sphere, max_stall=iters + 1, engine=engine)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed / len(curve))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark swo() engines per iteration.')
+    parser.add_argument('--dims', type=str, default='2,10,100,1000', help='Comma-separated dimensions')
+    parser.add_argument('--agents', type=int, default=30, help='Population size')
+    parser.add_argument('--iters', type=int, default=20, help='Iterations per run')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'dim':>6} {'loop ms/it':>12} {'vector ms/it':>14} {'speedup':>9}")
+    for dim in (int(d) for d in args.dims.split(',')):
+        loop = time_per_iteration('loop', dim, args.agents, args.iters, args.repeats)
+        vectorized = time_per_iteration('vectorized', dim, args.agents, args.iters, args.repeats)
+        print(f"{dim:>6} {loop * 1e3:>12.3f} {vectorized * 1e3:>14.3f} {loop / vectorized:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
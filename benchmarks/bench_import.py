@@ -0,0 +1,73 @@
+"""Import-time budget check for the optimizer and the headless main.py path.
+
+Each module is imported in a fresh interpreter with -X importtime, --repeats
+times. Its cost is the cumulative import time minus the time spent importing
+NumPy in the same interpreter (NumPy alone varies by tens of milliseconds from
+run to run); the best repeat is kept. The check fails (exit status 1) if a
+module costs more than --budget-ms on top of NumPy, or if importing it loads
+any of the heavy modules that must stay lazy (matplotlib, scipy, the
+process-pool and TCP stacks, cProfile). main.py is checked by import only,
+which is the whole of the startup cost of `python main.py --no-plot`.
+
+Usage:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --budget-ms 15 --repeats 7
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ('sw_optimizer.sw_optimizer', 'sw_optimizer.batched', 'main')
+
+# Модули, которые должны загружаться только по требованию
+LAZY = ('matplotlib', 'mpl_toolkits', 'scipy', 'concurrent.futures', 'multiprocessing', 'socket', 'cProfile',
+        'pstats', 'PyQt5')
+
+
+def import_time(module):
+    """Импорт module в новом интерпретаторе: (всего, из них NumPy) в секундах и загруженные модули."""
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT, capture_output=True, text=True,
+                         check=True)
+    cumulative = {}
+    for line in out.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative.setdefault(fields[2].strip(), int(fields[1]) / 1e6)
+    if module not in cumulative:
+        raise RuntimeError(f"No import time reported for {module}:\n{out.stderr[-2000:]}")
+    return cumulative[module], cumulative.get('numpy', 0.0), set(out.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the import time of the optimizer modules against a budget.')
+    parser.add_argument('--budget-ms', type=float, default=25.0,
+                        help='Allowed import time on top of numpy, ms (default 25)')
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreters per module (best is kept)')
+    args = parser.parse_args()
+
+    # Скомпилированные .pyc, чтобы не мерить компиляцию исходников
+    subprocess.run([sys.executable, '-m', 'compileall', '-q', ROOT], cwd=ROOT, capture_output=True)
+    print(f"{'module':<28} {'import ms':>10} {'over numpy':>11}  heavy modules loaded")
+
+    failures = 0
+    for module in MODULES:
+        results = [import_time(module) for _ in range(args.repeats)]
+        best = min(total for total, _, _ in results)
+        overhead = min(total - numpy for total, numpy, _ in results)
+        loaded = [lazy for lazy in LAZY
+                  if any(name == lazy or name.startswith(lazy + '.') for *_, modules in results for name in modules)]
+        over_budget = overhead * 1e3 > args.budget_ms
+        failures += over_budget or bool(loaded)
+        flag = ' OVER BUDGET' if over_budget else ''
+        print(f"{module:<28} {best * 1e3:>10.1f} {overhead * 1e3:>+10.1f}  {', '.join(loaded) or '-'}{flag}")
+
+    print(f"{failures} of {len(MODULES)} modules over the {args.budget_ms:.0f} ms budget or loading heavy modules")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Solution quality and wall time of the island model against a single population.
+
+Each configuration is run --runs times with seeds 0..runs-1: a single swo()
+population with --agents agents and swo_islands() with --islands islands of
+--agents agents each (ring and fully-connected topologies).
+
+Usage:
+    python -m benchmarks.bench_islands --islands 4 --agents 30 --tmax 500 --runs 5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from sw_optimizer.islands import TOPOLOGIES, swo_islands
+from sw_optimizer.sw_optimizer import swo
+from test_functions.eggholder_function import eggholder_function
+from test_functions.schwefel_function import schwefel_function
+
+# Функция, размерность и граница области
+FUNCTIONS = {
+    'schwefel': (schwefel_function, 10, 500.0),
+    'eggholder': (eggholder_function, 2, 512.0),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare island-model SWO with a single population.')
+    parser.add_argument('--islands', type=int, default=4, help='Number of islands (processes)')
+    parser.add_argument('--agents', type=int, default=30, help='Agents per population')
+    parser.add_argument('--tmax', type=int, default=500, help='Maximum number of iterations')
+    parser.add_argument('--interval', type=int, default=25, help='Migration interval in iterations')
+    parser.add_argument('--runs', type=int, default=5, help='Seeded runs per configuration')
+    args = parser.parse_args()
+
+    print(f"{'function':>10} {'mode':>8} {'median best':>14} {'worst best':>14} {'neval':>8} {'wall s':>8}")
+    for name, (fobj, dim, bound) in FUNCTIONS.items():
+        ub, lb = np.full(dim, bound), np.full(dim, -bound)
+        modes = {'single': lambda seed: swo(args.agents, args.tmax, ub, lb, dim, fobj, seed=seed)}
+        for topology in TOPOLOGIES:
+            modes[topology] = lambda seed, topology=topology: swo_islands(
+                args.agents, args.tmax, ub, lb, dim, fobj, islands=args.islands, migration_interval=args.interval,
+                topology=topology, seed=seed)
+        for mode, run in modes.items():
+            start = time.perf_counter()
+            results = [run(seed) for seed in range(args.runs)]
+            wall = (time.perf_counter() - start) / args.runs
+            scores = [r[0] for r in results]
+            neval = np.mean([r[3] for r in results])
+            print(f"{name:>10} {mode:>8} {np.median(scores):>14.6g} {np.max(scores):>14.6g} {neval:>8.0f} {wall:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
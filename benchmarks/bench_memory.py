@@ -0,0 +1,57 @@
+"""Peak memory and iteration time of the float32 / low-memory modes at high dimension.
+
+Peak memory is the tracemalloc peak over a whole swo() run (NumPy reports its
+array allocations to tracemalloc), so it covers the population, the
+per-iteration random blocks and all temporaries.
+
+Usage:
+    python -m benchmarks.bench_memory --dims 10000,100000 --agents 30 --iters 10
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import swo
+from test_functions.sphere import sphere
+
+# Название, engine, dtype, low_memory
+MODES = (
+    ('loop float64', 'loop', np.float64, False),
+    ('loop float32', 'loop', np.float32, False),
+    ('loop float32 low-mem', 'loop', np.float32, True),
+    ('vectorized float64', 'vectorized', np.float64, False),
+    ('vectorized float32', 'vectorized', np.float32, False),
+)
+
+
+def measure(engine, dtype, low_memory, dim, agents, iters):
+    ub = np.full(dim, 100.0)
+    lb = -ub
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, _, curve, _, _ = swo(agents, iters, ub, lb, dim, sphere, max_stall=None, engine=engine, seed=0,
+                            dtype=dtype, low_memory=low_memory)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed / len(curve)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak memory and iteration time of the low-memory modes.')
+    parser.add_argument('--dims', type=str, default='10000,100000', help='Comma-separated dimensions')
+    parser.add_argument('--agents', type=int, default=30, help='Population size')
+    parser.add_argument('--iters', type=int, default=10, help='Iterations per run')
+    args = parser.parse_args()
+
+    print(f"{'dim':>7} {'mode':>22} {'peak MB':>9} {'ms/it':>9}")
+    for dim in (int(d) for d in args.dims.split(',')):
+        for name, engine, dtype, low_memory in MODES:
+            peak, per_iteration = measure(engine, dtype, low_memory, dim, args.agents, args.iters)
+            print(f"{dim:>7} {name:>22} {peak / 2 ** 20:>9.1f} {per_iteration * 1e3:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
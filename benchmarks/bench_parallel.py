@@ -0,0 +1,50 @@
+"""Wall-clock scaling of swo() with process-pool evaluation.
+
+The objective is a CPU-bound sphere that burns --cost-ms of CPU per call,
+standing in for an expensive simulation. With --sleep it sleeps instead,
+which shows the dispatch scaling even on a machine with fewer cores than
+workers (as if the objective waited for an external solver).
+
+Usage:
+    python -m benchmarks.bench_parallel --max-workers 8 --cost-ms 10
+    python -m benchmarks.bench_parallel --max-workers 8 --cost-ms 20 --sleep
+"""
+import argparse
+import os
+import time
+
+from benchmarks.bench_distributed import ExpensiveSphere
+from sw_optimizer.sw_optimizer import swo
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parallel evaluation scaling of swo().')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(), help='Largest worker count to try')
+    parser.add_argument('--cost-ms', type=float, default=10.0, help='CPU time per objective call, ms')
+    parser.add_argument('--agents', type=int, default=32, help='Population size')
+    parser.add_argument('--iters', type=int, default=5, help='Iterations per run')
+    parser.add_argument('--dim', type=int, default=10, help='Problem dimension')
+    parser.add_argument('--sleep', action='store_true', help='Spend the cost sleeping instead of computing')
+    args = parser.parse_args()
+    # Стоимость передаётся в самом объекте, поэтому доходит и до spawn/forkserver-процессов
+    fobj = ExpensiveSphere(args.cost_ms, args.sleep)
+
+    lb = [-512] * args.dim
+    ub = [512] * args.dim
+    start = time.perf_counter()
+    swo(args.agents, args.iters, ub, lb, args.dim, fobj, engine='vectorized', seed=0)
+    serial = time.perf_counter() - start
+    print(f"{'workers':>8} {'wall s':>9} {'speedup':>9}")
+    print(f"{'serial':>8} {serial:>9.2f} {1.0:>8.2f}x")
+
+    workers = 1
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        swo(args.agents, args.iters, ub, lb, args.dim, fobj, engine='vectorized', seed=0, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:>9.2f} {serial / elapsed:>8.2f}x")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
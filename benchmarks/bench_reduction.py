@@ -0,0 +1,59 @@
+"""Evaluations-to-target of the population reduction schedules.
+
+For every function and schedule, --runs seeded runs are made; a run's
+evaluations-to-target is neval at the end of the first iteration whose best
+score is within --target of the known optimum (runs that never get there
+count as failures).
+
+Usage:
+    python -m benchmarks.bench_reduction --agents 100 --dim 10 --runs 10
+"""
+import argparse
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import REDUCTIONS, SpiderWaspOptimizer
+from test_functions.ackley import ackley
+from test_functions.rastrigin import rastrigin
+from test_functions.sphere import sphere
+
+# Функции с известным минимумом 0
+FUNCTIONS = {
+    'sphere': (sphere, 512),
+    'rastrigin': (rastrigin, 5.12),
+    'ackley': (ackley, 32.768),
+}
+
+
+def evaluations_to_target(fobj, bound, reduction, args, seed):
+    optimizer = SpiderWaspOptimizer(args.agents, args.tmax, [bound] * args.dim, [-bound] * args.dim, args.dim,
+                                    max_stall=args.tmax, engine=args.engine, seed=seed, name=fobj.__name__,
+                                    reduction=reduction)
+    for state in optimizer.iterate(fobj):
+        if state.best_score <= args.target:
+            return state.neval
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare population reduction schedules by evaluations-to-target.')
+    parser.add_argument('--agents', type=int, default=100, help='Initial population size')
+    parser.add_argument('--dim', type=int, default=10, help='Problem dimension')
+    parser.add_argument('--tmax', type=int, default=500, help='Maximum number of iterations')
+    parser.add_argument('--runs', type=int, default=10, help='Seeded runs per function and schedule')
+    parser.add_argument('--target', type=float, default=1e-6, help='Distance to the optimum counted as success')
+    parser.add_argument('--engine', type=str, default='vectorized', help='Optimizer engine')
+    args = parser.parse_args()
+
+    print(f"{'function':>11} {'reduction':>10} {'success':>8} {'median evals':>13} {'mean evals':>11}")
+    for name, (fobj, bound) in FUNCTIONS.items():
+        for reduction in REDUCTIONS:
+            hits = [evaluations_to_target(fobj, bound, reduction, args, seed) for seed in range(args.runs)]
+            reached = [h for h in hits if h is not None]
+            median = f'{np.median(reached):.0f}' if reached else '-'
+            mean = f'{np.mean(reached):.0f}' if reached else '-'
+            print(f"{name:>11} {reduction:>10} {len(reached) / args.runs:>8.0%} {median:>13} {mean:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""True-evaluation savings of surrogate pre-screening (prescreen) at equal final quality.
+
+Every run stops when its best score is within --target of the function's
+known optimum (target_value) or after --max-evals objective calls, so plain
+and pre-screened runs are compared at the same final quality: the table
+shows the success rate, the median number of real evaluations of the
+successful runs and the saving against prescreen=None. The wall time
+includes the model fitting, which matters only for cheap objectives.
+
+Usage:
+    python -m benchmarks.bench_surrogate --runs 10 --prescreen 1,4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import swo
+from test_functions.registry import get_function
+
+# Функции и размерности по умолчанию
+FUNCTIONS = ('sphere/10', 'rastrigin/10', 'ackley/10', 'rosenbrock/5', 'schwefel_function/5', 'himmelblau/2',
+             'eggholder_function/2', 'bukin_function_n6/2')
+
+
+def evaluations_to_target(spec, dim, prescreen, args, seed):
+    lb, ub = spec.bounds(dim)
+    _, _, _, neval, _, info = swo(args.agents, args.tmax, ub, lb, dim, spec.load(dim), max_stall=None,
+                                  engine='vectorized', seed=seed, target_value=spec.optimum, target_tol=args.target,
+                                  max_evals=args.max_evals, prescreen=prescreen, full_output=True)
+    return neval if info['stop_reason'] == 'target_value' else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure real-evaluation savings of surrogate pre-screening.')
+    parser.add_argument('--functions', type=str, default=','.join(FUNCTIONS),
+                        help='Comma-separated name/dim pairs from the test function registry')
+    parser.add_argument('--prescreen', type=str, default='1,4', help='Comma-separated candidates per agent')
+    parser.add_argument('--agents', type=int, default=30, help='Population size')
+    parser.add_argument('--tmax', type=int, default=2000, help='Maximum number of iterations')
+    parser.add_argument('--max-evals', type=int, default=20000, help='Evaluation budget per run')
+    parser.add_argument('--target', type=float, default=1e-3, help='Distance to the optimum counted as success')
+    parser.add_argument('--runs', type=int, default=10, help='Seeded runs per function and mode')
+    args = parser.parse_args()
+
+    modes = [None] + [int(k) for k in args.prescreen.split(',')]
+    print(f"{'function':>22} {'dim':>4} {'prescreen':>9} {'success':>8} {'median evals':>13} {'saving':>7} "
+          f"{'time':>7}")
+    for item in args.functions.split(','):
+        name, dim = item.split('/')
+        spec, dim = get_function(name), int(dim)
+        baseline = None
+        for prescreen in modes:
+            start = time.perf_counter()
+            hits = [evaluations_to_target(spec, dim, prescreen, args, seed) for seed in range(args.runs)]
+            elapsed = time.perf_counter() - start
+            reached = [h for h in hits if h is not None]
+            median = np.median(reached) if reached else None
+            if prescreen is None:
+                baseline = median
+            saving = f'{1 - median / baseline:.0%}' if median is not None and baseline else '-'
+            print(f"{name:>22} {dim:>4} {str(prescreen):>9} {len(reached) / args.runs:>8.0%} "
+                  f"{median if median is not None else '-':>13} {saving:>7} {elapsed:>6.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""Performance regression suite: JSON baselines and a compare command.
+
+`run` measures, for every function in test_functions and every combination
+of engine, population size and dimension, the time per iteration,
+evaluations per second and peak memory of a swo() run, plus micro-benchmarks
+of levy_flight and initialize_positions. `compare` checks a result file
+against a baseline and exits with status 1 if any metric got worse by more
+than --threshold (relative). Baselines are machine-specific: record one on
+the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite run --output benchmarks/baselines/local.json
+    python -m benchmarks.suite run --output current.json
+    python -m benchmarks.suite compare benchmarks/baselines/local.json current.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import swo
+from test_functions.registry import function_names, get_function
+from utils.initialization import initialize_positions
+from utils.levy_flight import levy_flight
+
+# Для каждой метрики: True, если больше - лучше
+METRICS = {
+    'time_per_iteration': False,
+    'evals_per_second': True,
+    'peak_memory': False,
+    'time_per_call': False,
+}
+
+
+def bench_swo(fobj, ub, lb, dim, agents, engine, iters, repeats, min_time):
+    """Время итерации, оценки в секунду и пик памяти запуска swo().
+
+    Один и тот же запуск (seed=0) повторяется не меньше repeats раз и не
+    меньше min_time секунд; берётся лучший повтор.
+    """
+    times = []
+    while len(times) < repeats or sum(times) < min_time:
+        start = time.perf_counter()
+        _, _, curve, neval, _ = swo(agents, iters, ub, lb, dim, fobj, max_stall=None, engine=engine, seed=0,
+                                    reduction='off')
+        times.append(time.perf_counter() - start)
+    best_time = min(times)
+
+    tracemalloc.start()
+    swo(agents, iters, ub, lb, dim, fobj, max_stall=None, engine=engine, seed=0, reduction='off')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'time_per_iteration': best_time / len(curve),
+        'evals_per_second': neval / best_time,
+        'peak_memory': peak,
+        'noise': noise(times),
+    }
+
+
+def bench_call(func, number, repeats, min_time):
+    """Лучшее среднее время вызова func() по сериям из number вызовов (как в bench_swo)."""
+    times = []
+    while len(times) < repeats or sum(times) < min_time:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append(time.perf_counter() - start)
+    return {'time_per_call': min(times) / number, 'noise': noise(times)}
+
+
+def noise(times):
+    """Относительный разброс повторов: (медиана - минимум) / минимум."""
+    return float((np.median(times) - min(times)) / min(times))
+
+
+def run(args):
+    rng = np.random.default_rng(0)
+    results = {}
+    for name in args.functions.split(','):
+        spec = get_function(name)
+        # Функции фиксированной размерности измеряются только в ней
+        dims = [dim for dim in (int(d) for d in args.dims.split(',')) if spec.supports(dim)] or [spec.min_dim]
+        for dim in dims:
+            fobj = spec.load(dim)
+            lb, ub = spec.bounds(dim)
+            for engine in args.engines.split(','):
+                for agents in (int(a) for a in args.agents.split(',')):
+                    key = f'swo/{name}/engine={engine}/agents={agents}/dim={dim}'
+                    results[key] = bench_swo(fobj, ub, lb, dim, agents, engine, args.iters, args.repeats,
+                                               args.min_time)
+                    print(f'{key:<60} {results[key]["time_per_iteration"] * 1e3:>9.3f} ms/it '
+                          f'{results[key]["evals_per_second"]:>11.0f} evals/s '
+                          f'{results[key]["peak_memory"] / 2 ** 20:>8.2f} MB')
+
+    for agents in (int(a) for a in args.agents.split(',')):
+        for dim in (int(d) for d in args.dims.split(',')):
+            ub, lb = np.full(dim, 100.0), np.full(dim, -100.0)
+            micro = {
+                f'levy_flight/shape=({agents},{dim})': lambda: levy_flight((agents, dim), rng),
+                f'initialize_positions/agents={agents}/dim={dim}':
+                    lambda: initialize_positions(agents, dim, ub, lb, rng),
+            }
+            for key, func in micro.items():
+                results[key] = bench_call(func, args.number, args.repeats, args.min_time)
+                print(f'{key:<60} {results[key]["time_per_call"] * 1e6:>9.2f} us/call')
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f'Results written to {args.output}')
+
+
+def compare_results(baseline, current, threshold):
+    """Список (ключ, метрика, база, текущее, относительное изменение, регрессия) по общим ключам."""
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        # Изменение времени в пределах разброса повторов обеих серий не считается регрессией
+        allowed = max(threshold, baseline[key].get('noise', 0.0) + current[key].get('noise', 0.0))
+        for metric, higher_is_better in METRICS.items():
+            if metric not in baseline[key] or metric not in current[key]:
+                continue
+            old, new = baseline[key][metric], current[key][metric]
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            limit = threshold if metric == 'peak_memory' else allowed
+            rows.append((key, metric, old, new, change, worse > limit))
+    return rows
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.current) as f:
+        current = json.load(f)['results']
+    rows = compare_results(baseline, current, args.threshold)
+    regressions = [row for row in rows if row[5]]
+    for key, metric, old, new, change, regressed in (regressions if args.only_regressions else rows):
+        flag = 'REGRESSION' if regressed else ''
+        print(f'{key:<60} {metric:<20} {old:>12.6g} {new:>12.6g} {change:>+8.1%} {flag}')
+    missing = baseline.keys() - current.keys()
+    if missing:
+        print(f'{len(missing)} baseline entries are missing from {args.current}')
+    print(f'{len(regressions)} regressions beyond {args.threshold:.0%} in {len(rows)} compared metrics')
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance regression suite for swo() and its utilities.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run the benchmarks and write a JSON result file')
+    run_parser.add_argument('--output', type=str, required=True, help='Path of the JSON result file')
+    run_parser.add_argument('--functions', type=str, default=','.join(function_names()),
+                            help='Comma-separated test functions')
+    run_parser.add_argument('--engines', type=str, default='loop,vectorized', help='Comma-separated engines')
+    run_parser.add_argument('--agents', type=str, default='30,100', help='Comma-separated population sizes')
+    run_parser.add_argument('--dims', type=str, default='2,10,100',
+                            help='Comma-separated dimensions (functions run only in the dimensions they support)')
+    run_parser.add_argument('--iters', type=int, default=20, help='Iterations per swo() run')
+    run_parser.add_argument('--repeats', type=int, default=5, help='Minimum repeats per measurement (best is kept)')
+    run_parser.add_argument('--min-time', type=float, default=0.5, help='Minimum seconds spent per measurement')
+    run_parser.add_argument('--number', type=int, default=200, help='Calls per micro-benchmark repeat')
+
+    compare_parser = commands.add_parser('compare', help='Compare a result file with a baseline')
+    compare_parser.add_argument('baseline', type=str, help='Baseline JSON file')
+    compare_parser.add_argument('current', type=str, help='Current JSON file')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='Relative worsening reported as a regression (default 0.1 = 10%%)')
+    compare_parser.add_argument('--only-regressions', action='store_true', help='Print only the regressions')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,111 @@
 import sys
 import os
 import csv
+import json
+import time
+import multiprocessing
+from queue import Empty
 import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QListWidget, QPushButton, QMessageBox, QComboBox, QGroupBox,
+    QListWidget, QListWidgetItem, QPushButton, QMessageBox, QComboBox, QGroupBox,
     QSplitter, QTableWidget, QTableWidgetItem, QStatusBar, QProgressBar,
     QFileDialog
 )
 from PyQt5.QtGui import QFont, QIcon, QColor
-from PyQt5.QtCore import Qt, QSettings
-import importlib
-from sw_optimizer.sw_optimizer import swo
+from PyQt5.QtCore import Qt, QSettings, QThread, QTimer, pyqtSignal
+from sw_optimizer.sw_optimizer import SpiderWaspOptimizer
+from test_functions.registry import REGISTRY, load_function
+from utils.results_store import ResultsStore
+
+STREAM_INTERVAL = 0.05  # How often a worker process sends convergence points, s
+REDRAW_INTERVAL = 100  # Plot redraw period, ms
+DIMS = (2, 3, 4)  # Dimensions offered by the dimension box
+CURVE_COLORS = ['b', 'g', 'r', 'c', 'm', 'y', (255, 165, 0), (128, 0, 128)]
+
+
+def optimize_in_process(func_name, dim, search_agents_no, Tmax, lb, ub, queue, cancel_event):
+    """Runs one optimization in a worker process and streams convergence points into queue."""
+    try:
+        func = load_function(func_name, dim)
+
+        # The entropy is stored with the run, so a GUI run can be reproduced later
+        seed = np.random.SeedSequence().entropy
+        start = time.perf_counter()
+        optimizer = SpiderWaspOptimizer(search_agents_no, Tmax, ub, lb, dim, seed=seed, name=func_name)
+        iterations, values = [], []
+        last_sent = time.monotonic()
+        for state in optimizer.iterate(func):
+            iterations.append(state.t)
+            values.append(float(state.best_score))
+            if cancel_event.is_set():
+                queue.put(('cancelled',))
+                return
+            if time.monotonic() - last_sent >= STREAM_INTERVAL:
+                queue.put(('progress', iterations, values))
+                iterations, values = [], []
+                last_sent = time.monotonic()
+        if iterations:
+            queue.put(('progress', iterations, values))
+
+        optimal_value, optimal_solution, convergence_curve, neval, _ = optimizer.result()
+        run = {'curve': convergence_curve, 'neval': neval, 'seed': seed, 'elapsed': time.perf_counter() - start,
+               'stop_reason': optimizer.stop_reason}
+        queue.put(('result', float(optimal_value), optimal_solution, run))
+    except Exception as e:
+        queue.put(('error', f'{type(e).__name__}: {e}'))
+
+
+class OptimizationWorker(QThread):
+    """Runs one function's optimization in a subprocess and relays its messages as Qt signals."""
+
+    progress = pyqtSignal(str, object, object)
+    result = pyqtSignal(str, float, object, object)
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal(str)
+
+    def __init__(self, func_name, dim, search_agents_no, Tmax, lb, ub, parent=None):
+        super().__init__(parent)
+        self.func_name = func_name
+        self.args = (func_name, dim, search_agents_no, Tmax, lb, ub)
+        # A spawned process does not inherit the GUI's threads, unlike fork
+        self.context = multiprocessing.get_context('spawn')
+        self.cancel_event = self.context.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        queue = self.context.Queue()
+        process = self.context.Process(target=optimize_in_process, args=self.args + (queue, self.cancel_event),
+                                       daemon=True)
+        process.start()
+        while True:
+            try:
+                message = queue.get(timeout=0.1)
+            except Empty:
+                if process.is_alive():
+                    continue
+                try:
+                    message = queue.get(timeout=0.5)
+                except Empty:
+                    self.failed.emit(self.func_name, f'Worker process exited with code {process.exitcode}')
+                    break
+
+            kind = message[0]
+            if kind == 'progress':
+                self.progress.emit(self.func_name, message[1], message[2])
+            elif kind == 'result':
+                self.result.emit(self.func_name, message[1], message[2], message[3])
+                break
+            elif kind == 'cancelled':
+                self.cancelled.emit(self.func_name)
+                break
+            else:
+                self.failed.emit(self.func_name, message[1])
+                break
+        process.join()
 
 
 class App(QWidget):
@@ -20,6 +113,18 @@ class App(QWidget):
         super().__init__()
         self.dark_mode = False
         self.settings = QSettings("YourCompany", "SWOOptimizer")
+        self.max_parallel = os.cpu_count() or 1
+        self.workers = {}
+        self.pending = []
+        self.completed = set()
+        self.curves = {}
+        self.curve_data = {}
+        self.dirty = set()
+        self.results = {}
+        self.store = ResultsStore()
+        self.redraw_timer = QTimer(self)
+        self.redraw_timer.setInterval(REDRAW_INTERVAL)
+        self.redraw_timer.timeout.connect(self.redraw_curves)
         self.initUI()
         self.load_theme()
 
@@ -64,13 +169,13 @@ class App(QWidget):
 
         self.function_list = QListWidget()
         self.function_list.setSelectionMode(QListWidget.MultiSelection)
-        functions = [
-            "ackley", "bukin_function_n6", "eggholder_function",
-            "himmelblau", "rastrigin", "rosenbrock",
-            "schwefel_function", "sphere"
-        ]
-        for func in functions:
-            self.function_list.addItem(func)
+        for spec in REGISTRY.values():
+            # Functions that cannot run at any offered dimension are not listed
+            if not any(spec.supports(dim) for dim in DIMS):
+                continue
+            item = QListWidgetItem(spec.name)
+            item.setToolTip(f"dim: {spec.dims}, bounds: [{spec.lb}, {spec.ub}], optimum: {spec.optimum}")
+            self.function_list.addItem(item)
 
         function_layout.addWidget(self.function_list)
         function_group.setLayout(function_layout)
@@ -80,7 +185,7 @@ class App(QWidget):
         dim_group = QGroupBox('Problem Dimension')
         dim_layout = QHBoxLayout()
         self.dim_combobox = QComboBox()
-        self.dim_combobox.addItems(["2", "3", "4"])
+        self.dim_combobox.addItems([str(dim) for dim in DIMS])
         self.dim_combobox.setToolTip("Select problem dimensionality")
         dim_layout.addWidget(self.dim_combobox)
         dim_group.setLayout(dim_layout)
@@ -92,6 +197,18 @@ class App(QWidget):
         self.run_button.clicked.connect(self.run_optimization)
         left_layout.addWidget(self.run_button)
 
+        # Cancel Button
+        self.cancel_button = QPushButton('Cancel')
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_optimization)
+        left_layout.addWidget(self.cancel_button)
+
+        # Stored runs of the selected functions, drawn next to the current ones
+        history_button = QPushButton('Compare with Stored Runs')
+        history_button.setToolTip("Plot the median convergence curve of earlier runs from the results store")
+        history_button.clicked.connect(self.show_history)
+        left_layout.addWidget(history_button)
+
         left_panel.setLayout(left_layout)
         main_splitter.addWidget(left_panel)
 
@@ -251,53 +368,149 @@ class App(QWidget):
             return
 
         dim = int(self.dim_combobox.currentText())
-
-        search_agents_no = 30
-        Tmax = 1000
-        lb = [-512] * dim
-        ub = [512] * dim
-
-        test_functions_dir = os.path.join(os.path.dirname(__file__), 'test_functions')
-        sys.path.append(test_functions_dir)
+        unsupported = [name for name in selected_functions if not REGISTRY[name].supports(dim)]
+        if unsupported:
+            QMessageBox.warning(self, "Warning", "Not defined for dim={}: {}".format(
+                dim, ', '.join(f'{name} (dim {REGISTRY[name].dims})' for name in unsupported)))
+            selected_functions = [name for name in selected_functions if name not in unsupported]
+            if not selected_functions:
+                return
+
+        self.search_agents_no = 30
+        self.Tmax = 1000
+        self.dim = dim
 
         self.plot_widget.clear()
         self.results_table.setRowCount(0)
         self.progress_bar.setValue(0)
 
-        colors = ['b', 'g', 'r', 'c', 'm', 'y', (255, 165, 0), (128, 0, 128)]
-
-        total_functions = len(selected_functions)
+        self.curves = {}
+        self.curve_data = {}
+        self.dirty = set()
+        self.results = {}
         for i, func_name in enumerate(selected_functions):
-            func_module = importlib.import_module(func_name.lower())
-            func = getattr(func_module, func_name)
-
-            optimal_value, optimal_solution, convergence_curve, _, _ = swo(
-                search_agents_no, Tmax, ub, lb, dim, func
-            )
-
-            self.status_bar.showMessage(f"Optimizing {func_name}... Done!", 5000)
-            self.plot_widget.plot(convergence_curve, pen=pg.mkPen(color=colors[i % len(colors)]), name=func_name)
-
-            row_position = self.results_table.rowCount()
-            self.results_table.insertRow(row_position)
-            self.results_table.setItem(row_position, 0, QTableWidgetItem(func_name))
-            self.results_table.setItem(row_position, 1, QTableWidgetItem(str(optimal_value)))
-            self.results_table.setItem(row_position, 2, QTableWidgetItem(str(optimal_solution)))
+            curve = self.plot_widget.plot([], [], pen=pg.mkPen(color=CURVE_COLORS[i % len(CURVE_COLORS)]),
+                                          name=func_name)
+            curve.setDownsampling(auto=True, method='peak')
+            curve.setClipToView(True)
+            self.curves[func_name] = curve
+            self.curve_data[func_name] = ([], [])
+
+        self.pending = list(selected_functions)
+        self.completed = set()
+        self.total_functions = len(selected_functions)
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.status_bar.showMessage(f"Optimizing {self.total_functions} function(s)...")
+        self.start_pending_workers()
+        self.redraw_timer.start()
+
+    def start_pending_workers(self):
+        while self.pending and len(self.workers) < self.max_parallel:
+            func_name = self.pending.pop(0)
+            lb, ub = REGISTRY[func_name].bounds(self.dim)
+            worker = OptimizationWorker(func_name, self.dim, self.search_agents_no, self.Tmax, lb, ub, self)
+            worker.progress.connect(self.on_progress)
+            worker.result.connect(self.on_result)
+            worker.failed.connect(self.on_failed)
+            worker.cancelled.connect(self.on_cancelled)
+            worker.finished.connect(lambda name=func_name: self.on_worker_finished(name))
+            self.workers[func_name] = worker
+            worker.start()
+
+    def cancel_optimization(self):
+        self.pending = []
+        for worker in self.workers.values():
+            worker.cancel()
+        self.cancel_button.setEnabled(False)
+        self.status_bar.showMessage("Cancelling...")
+
+    def on_progress(self, func_name, iterations, values):
+        xs, ys = self.curve_data[func_name]
+        xs.extend(iterations)
+        ys.extend(values)
+        self.dirty.add(func_name)
+
+    def on_result(self, func_name, optimal_value, optimal_solution, run):
+        self.status_bar.showMessage(f"Optimizing {func_name}... Done!", 5000)
+        self.results[func_name] = (optimal_value, optimal_solution, run)
+        try:
+            self.store.append(func_name, self.dim, optimal_value, optimal_solution, run['curve'], run['neval'],
+                              seed=run['seed'], config={'agents': self.search_agents_no, 'tmax': self.Tmax,
+                                                        'engine': 'loop'},
+                              elapsed=run['elapsed'], stop_reason=run['stop_reason'], source='gui')
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save the {func_name} run to {self.store.path}:\n{e}")
+        row_position = self.results_table.rowCount()
+        self.results_table.insertRow(row_position)
+        self.results_table.setItem(row_position, 0, QTableWidgetItem(func_name))
+        self.results_table.setItem(row_position, 1, QTableWidgetItem(str(optimal_value)))
+        self.results_table.setItem(row_position, 2, QTableWidgetItem(str(optimal_solution)))
+
+    def on_failed(self, func_name, message):
+        QMessageBox.warning(self, "Error", f"Optimization of {func_name} failed:\n{message}")
+
+    def on_cancelled(self, func_name):
+        self.status_bar.showMessage(f"Optimizing {func_name}... Cancelled", 5000)
+
+    def on_worker_finished(self, func_name):
+        self.completed.add(func_name)
+        self.workers.pop(func_name).deleteLater()
+        self.start_pending_workers()
+        if not self.workers:
+            self.redraw_timer.stop()
+            self.redraw_curves()
+            self.run_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+
+    def redraw_curves(self):
+        # Redraw only curves that received new points since the last tick
+        for func_name in self.dirty:
+            xs, ys = self.curve_data[func_name]
+            self.curves[func_name].setData(xs, ys)
+        self.dirty.clear()
+
+        # A run may stop before Tmax on stagnation, so a finished function counts as complete
+        done = sum(self.Tmax if name in self.completed else len(xs) for name, (xs, _) in self.curve_data.items())
+        self.progress_bar.setValue(int(done / (self.total_functions * self.Tmax) * 100))
+
+    def closeEvent(self, event):
+        self.cancel_optimization()
+        for worker in list(self.workers.values()):
+            worker.wait()
+        super().closeEvent(event)
+
+    def show_history(self):
+        selected_functions = [item.text() for item in self.function_list.selectedItems()]
+        if not selected_functions:
+            QMessageBox.warning(self, "Warning", "Please select at least one function.")
+            return
 
-            # Update progress bar
-            self.progress_bar.setValue(int((i + 1) / total_functions * 100))
+        dim = int(self.dim_combobox.currentText())
+        table = self.store.load(dim=dim)
+        shown = 0
+        for i, func_name in enumerate(selected_functions):
+            indices = table.where(function=func_name)
+            if not len(indices):
+                continue
+            curve = np.median(table.curves(indices), axis=0)
+            pen = pg.mkPen(color=CURVE_COLORS[i % len(CURVE_COLORS)], style=Qt.DashLine)
+            self.plot_widget.plot(np.arange(1, len(curve) + 1), curve, pen=pen,
+                                  name=f'{func_name} (stored median, {len(indices)} runs)')
+            shown += len(indices)
+        self.status_bar.showMessage(f"{shown} stored run(s) for dim={dim} from {self.store.path}", 5000)
 
     def export_results(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "Export Results", "", "CSV Files (*.csv)")
         if file_path:
+            # Full precision: floats are written with repr, the solution as a JSON list
             with open(file_path, mode='w', newline='') as file:
                 writer = csv.writer(file)
-                writer.writerow(['Function', 'Optimal Value', 'Optimal Solution'])
-                for row in range(self.results_table.rowCount()):
-                    function = self.results_table.item(row, 0).text()
-                    value = self.results_table.item(row, 1).text()
-                    solution = self.results_table.item(row, 2).text()
-                    writer.writerow([function, value, solution])
+                writer.writerow(['Function', 'Dim', 'Optimal Value', 'Optimal Solution', 'Evaluations', 'Iterations',
+                                 'Seed', 'Elapsed (s)', 'Stop Reason'])
+                for func_name, (value, solution, run) in self.results.items():
+                    writer.writerow([func_name, self.dim, repr(value), json.dumps(solution.tolist()), run['neval'],
+                                     len(run['curve']), run['seed'], repr(run['elapsed']), run['stop_reason']])
             QMessageBox.information(self, "Export", "Results exported successfully!")
 
 
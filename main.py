@@ -1,25 +1,28 @@
-import matplotlib
-
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 import argparse
-import importlib
-import sys
-import os
+import json
+import time
 from sw_optimizer.sw_optimizer import swo
+from test_functions.registry import function_names, get_function
+from utils.grid_cache import GRID_CACHE_DIR, evaluate_grid
+from utils.results_store import RESULTS_DIR, ResultsStore
 
 
-def plot_function(func, lb, ub, dim, optimal_solution, projection='3d'):
-    if dim > 2 and projection == '3d':
-        # Plot only the first two dimensions
-        x = np.linspace(lb[0], ub[0], 100)
-        y = np.linspace(lb[1], ub[1], 100)
-        X, Y = np.meshgrid(x, y)
-        Z = np.array([func(np.array([x, y] + [0] * (dim - 2))) for x, y in zip(np.ravel(X), np.ravel(Y))])
-        Z = Z.reshape(X.shape)
+def pyplot():
+    """Imports matplotlib on first use, so --runs and --no-plot never pay for it."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def plot_function(func, lb, ub, dim, optimal_solution, projection='3d', resolution=100, cache_dir=GRID_CACHE_DIR):
+    plt = pyplot()
+    # Plot only the first two dimensions, the remaining coordinates are fixed at zero
+    X, Y, Z = evaluate_grid(func, lb, ub, dim, resolution=resolution, cache_dir=cache_dir)
 
+    if dim > 2 and projection == '3d':
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 - registers the 3d projection
         fig = plt.figure()
         ax = fig.add_subplot(111, projection='3d')
         ax.plot_surface(X, Y, Z, cmap='viridis')
@@ -31,15 +34,6 @@ def plot_function(func, lb, ub, dim, optimal_solution, projection='3d'):
         plt.close(fig)  # Close the figure to free up memory
     else:
         # Plot the function
-        x = np.linspace(lb[0], ub[0], 100)
-        y = np.linspace(lb[1], ub[1], 100)
-        X, Y = np.meshgrid(x, y)
-        if dim > 2:
-            Z = np.array([func(np.array([x, y] + [0] * (dim - 2))) for x, y in zip(np.ravel(X), np.ravel(Y))])
-        else:
-            Z = np.array([func(np.array([x, y])) for x, y in zip(np.ravel(X), np.ravel(Y))])
-        Z = Z.reshape(X.shape)
-
         fig, ax = plt.subplots()
         cs = ax.contour(X, Y, Z)
         ax.clabel(cs, inline=1, fontsize=10)
@@ -50,53 +44,262 @@ def plot_function(func, lb, ub, dim, optimal_solution, projection='3d'):
         plt.close(fig)  # Close the figure to free up memory
 
 
+class TargetCounter:
+    """Wraps an objective and records the evaluation number at which it first reaches the target."""
+
+    def __init__(self, func, target):
+        self.func = func
+        self.target = target
+        self.__name__ = func.__name__
+        self.batch = getattr(func, 'batch', False)
+        self.neval = 0
+        self.hit_at = None
+
+    def __call__(self, x):
+        values = self.func(x)
+        if self.hit_at is None and self.target is not None:
+            hits = np.flatnonzero(np.atleast_1d(values) <= self.target)
+            if hits.size:
+                self.hit_at = self.neval + int(hits[0]) + 1
+        self.neval += np.size(values)
+        return values
+
+
+def single_run(func_name, dim, seed, search_agents_no, Tmax, target, optimum_tol=None):
+    spec = get_function(func_name)
+    if target is None and optimum_tol is not None:
+        target = spec.optimum + optimum_tol
+    func = TargetCounter(spec.load(dim), target)
+    lb, ub = spec.bounds(dim)
+    start = time.perf_counter()
+    optimal_value, optimal_solution, convergence_curve, total_evaluations, _, info = swo(
+        search_agents_no, Tmax, ub, lb, dim, func, seed=seed,
+        target_value=spec.optimum if optimum_tol is not None else None, target_tol=optimum_tol or 0.0,
+        full_output=True)
+    return {
+        'function': func_name,
+        'dim': dim,
+        'seed': seed,
+        'best': float(optimal_value),
+        'neval': int(total_evaluations),
+        'target': target,
+        'evals_to_target': func.hit_at,
+        'elapsed': time.perf_counter() - start,
+        'stop_reason': info['stop_reason'],
+        # The arrays go to the results store, not to the JSON summary
+        'solution': optimal_solution,
+        'curve': convergence_curve,
+    }
+
+
+def store_run(store, run, config):
+    """Appends a single_run() result to the results store and strips its arrays."""
+    solution, curve = run.pop('solution'), run.pop('curve')
+    if store is not None:
+        store.append(run['function'], run['dim'], run['best'], solution, curve, run['neval'], seed=run['seed'],
+                     config=config, elapsed=run['elapsed'], stop_reason=run['stop_reason'], source='main',
+                     target=run['target'], evals_to_target=run['evals_to_target'])
+
+
+def summarize(runs):
+    best = np.array([run['best'] for run in runs])
+    hits = [run['evals_to_target'] for run in runs if run['evals_to_target'] is not None]
+    return {
+        'function': runs[0]['function'],
+        'dim': runs[0]['dim'],
+        'runs': len(runs),
+        'best': float(best.min()),
+        'mean': float(best.mean()),
+        'median': float(np.median(best)),
+        'std': float(best.std()),
+        'success_rate': len(hits) / len(runs) if runs[0]['target'] is not None else None,
+        'mean_evals_to_target': float(np.mean(hits)) if hits else None,
+        'median_evals_to_target': float(np.median(hits)) if hits else None,
+    }
+
+
+def run_statistics(functions, dims, args):
+    """Runs args.runs seeded swo() runs for every function x dimension pair in a process pool."""
+    from concurrent.futures import ProcessPoolExecutor
+    jobs = [(func_name, dim) for func_name in functions for dim in dims]
+    seed_sequence = np.random.SeedSequence(args.seed)
+    seeds = seed_sequence.generate_state(len(jobs) * args.runs)
+    store = None if args.no_results else ResultsStore(args.results)
+    config = {'agents': args.agents, 'tmax': args.tmax, 'engine': 'loop', 'optimum_tol': args.optimum_tol,
+              'base_seed': seed_sequence.entropy}
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = {
+            (func_name, dim): [
+                executor.submit(single_run, func_name, dim, int(seeds[j * args.runs + r]),
+                                args.agents, args.tmax, args.target, args.optimum_tol)
+                for r in range(args.runs)
+            ]
+            for j, (func_name, dim) in enumerate(jobs)
+        }
+        results = []
+        for (func_name, dim), run_futures in futures.items():
+            runs = [future.result() for future in run_futures]
+            for run in runs:
+                store_run(store, run, config)
+            summary = summarize(runs)
+            results.append({'summary': summary, 'runs': runs})
+            print(f"{func_name} (dim={dim}): best={summary['best']:.6g} mean={summary['mean']:.6g} "
+                  f"median={summary['median']:.6g} std={summary['std']:.6g} "
+                  f"success_rate={summary['success_rate']}")
+
+    report = {
+        'config': {'runs': args.runs, 'seed': seed_sequence.entropy, 'agents': args.agents, 'tmax': args.tmax,
+                   'target': args.target, 'optimum_tol': args.optimum_tol, 'functions': functions, 'dims': dims},
+        'results': results,
+    }
+    with open(args.summary, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Summary saved to {args.summary}")
+    if store is not None:
+        print(f"Runs appended to {store.path}")
+
+
+def show_history(functions, dims, args):
+    """Summarizes and plots the stored runs of the selected functions without rerunning them."""
+    table = ResultsStore(args.results).load()
+    curves = []
+    for func_name in functions:
+        for dim in dims:
+            indices = table.where(function=func_name, dim=dim)
+            if not len(indices):
+                print(f"{func_name} (dim={dim}): no stored runs in {args.results}")
+                continue
+            best = table['best'][indices]
+            print(f"{func_name} (dim={dim}): runs={len(indices)} best={best.min():.6g} mean={best.mean():.6g} "
+                  f"median={np.median(best):.6g} std={best.std():.6g} "
+                  f"median_neval={np.median(table['neval'][indices]):.0f}")
+            curves.append((np.median(table.curves(indices), axis=0), f'{func_name} (dim={dim}, {len(indices)} runs)'))
+    if curves and not args.no_plot:
+        plt = pyplot()
+        plt.figure()
+        for curve, label in curves:
+            plt.plot(curve, label=label)
+        plt.xlabel('Iteration')
+        plt.ylabel('Median fitness')
+        plt.yscale('symlog', linthresh=1e-8)
+        plt.title('Stored runs')
+        plt.legend()
+        plt.savefig('history.png')
+        print("History plot saved to history.png")
+        plt.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run SWO algorithm with 2D or 3D projection.')
     parser.add_argument('--projection', type=str, choices=['2d', '3d'], default='3d',
                         help='Choose between 2D and 3D projection')
-    parser.add_argument('--function', type=str, required=True, help='Select the test functions, separated by commas')
-    parser.add_argument('--dim', type=int, default=4, help='Dimension of the test functions')
+    parser.add_argument('--function', type=str, required=True,
+                        help=f"Select the test functions, separated by commas ({', '.join(function_names())})")
+    parser.add_argument('--dim', type=str, default='4',
+                        help='Dimension of the test functions (comma-separated list with --runs)')
+    parser.add_argument('--agents', type=int, default=30, help='Number of search agents')
+    parser.add_argument('--tmax', type=int, default=1000, help='Maximum number of iterations')
+    parser.add_argument('--runs', type=int, default=None,
+                        help='Run N independent seeded runs per function and dimension and report statistics')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed (base seed for --runs); unseeded runs are recorded with their entropy')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for --runs (default: all cores)')
+    parser.add_argument('--target', type=float, default=None,
+                        help='Fitness target for success rate and evaluations-to-target with --runs')
+    parser.add_argument('--optimum-tol', type=float, default=None,
+                        help="Stop a run once it is within this distance of the function's known optimum "
+                             "(also the success target with --runs unless --target is given)")
+    parser.add_argument('--resolution', type=int, default=100, help='Grid resolution of the function plots')
+    parser.add_argument('--grid-cache', type=str, default=GRID_CACHE_DIR,
+                        help='Directory for cached function grids')
+    parser.add_argument('--no-grid-cache', action='store_true', help='Always recompute the function grids')
+    parser.add_argument('--summary', type=str, default='summary.json', help='JSON summary file for --runs')
+    parser.add_argument('--results', type=str, default=RESULTS_DIR,
+                        help='Results store every run is appended to (solutions, curves, neval, seed, config)')
+    parser.add_argument('--no-results', action='store_true', help='Do not append runs to the results store')
+    parser.add_argument('--history', action='store_true',
+                        help='Summarize and plot the stored runs of the selected functions instead of running')
+    parser.add_argument('--no-plot', action='store_true',
+                        help='Headless mode: print the results only, without importing matplotlib or drawing plots')
     args = parser.parse_args()
 
-    search_agents_no = 30
-    Tmax = 1000
-    dim = args.dim  # Use the dimension provided by the user
-    lb = [-512] * dim
-    ub = [512] * dim
+    # Split the functions and process each one
+    functions = [name.strip() for name in args.function.split(',') if name.strip()]
+    try:
+        dims = [int(d) for d in args.dim.split(',') if d.strip()]
+    except ValueError:
+        parser.error(f'--dim must be a comma-separated list of integers, got {args.dim!r}')
+    if not dims:
+        parser.error('--dim needs at least one dimension')
+    for func_name in functions:
+        try:
+            for dim in dims:
+                get_function(func_name).check_dim(dim)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.history:
+        show_history(functions, dims, args)
+        return
 
-    # Add the directory containing the test functions to the Python path
-    test_functions_dir = os.path.join(os.path.dirname(__file__), 'test_functions')
-    sys.path.append(test_functions_dir)
+    if args.runs is not None:
+        run_statistics(functions, dims, args)
+        return
 
-    # Split the functions and process each one
-    functions = args.function.split(',')
+    if len(dims) > 1:
+        parser.error('Several dimensions are only supported together with --runs')
+
+    search_agents_no = args.agents
+    Tmax = args.tmax
+    dim = dims[0]  # Use the dimension provided by the user
+    store = None if args.no_results else ResultsStore(args.results)
 
     # Initialize a figure for the convergence plot
-    plt.figure()
+    plt = None if args.no_plot else pyplot()
+    if plt is not None:
+        plt.figure()
 
     for func_name in functions:
-        # Dynamically import the selected function
-        func_module = importlib.import_module(func_name.strip().lower())
-        func = getattr(func_module, func_name.strip())
+        # The registry imports the function module on first use and knows its search box
+        spec = get_function(func_name)
+        func = spec.load(dim)
+        lb, ub = spec.bounds(dim)
+        # Unseeded runs are recorded with the entropy they used, so every stored run can be reproduced
+        seed = np.random.SeedSequence(args.seed).entropy
 
-        optimal_value, optimal_solution, convergence_curve, total_evaluations, evaluations_per_function = swo(
-            search_agents_no, Tmax, ub, lb, dim, func)
+        start = time.perf_counter()
+        optimal_value, optimal_solution, convergence_curve, total_evaluations, evaluations_per_function, info = swo(
+            search_agents_no, Tmax, ub, lb, dim, func, seed=seed,
+            target_value=spec.optimum if args.optimum_tol is not None else None,
+            target_tol=args.optimum_tol or 0.0, full_output=True)
+        elapsed = time.perf_counter() - start
+        if store is not None:
+            store.append(func_name, dim, optimal_value, optimal_solution, convergence_curve, total_evaluations,
+                         seed=seed, config={'agents': search_agents_no, 'tmax': Tmax, 'engine': 'loop',
+                                            'optimum_tol': args.optimum_tol},
+                         elapsed=elapsed, stop_reason=info['stop_reason'], source='main')
 
-        print(f"Results for {func_name.strip()}:")
-        print(f"Optimal Value (fmin): {optimal_value}")
+        print(f"Results for {func_name}:")
+        print(f"Optimal Value (fmin): {optimal_value} (known optimum: {spec.optimum})")
         print(f"Optimal Solution (xmin): {optimal_solution}")
         print(f"Total Evaluations (neval): {total_evaluations}")
-        print(f"Evaluations for {func_name.strip()}: {evaluations_per_function[func_name.strip()]}")
+        print(f"Evaluations for {func_name}: {evaluations_per_function[func_name]}")
+        if plt is None:
+            continue
 
         # Plot the convergence curve
         if convergence_curve.size > 0:
-            plt.plot(convergence_curve, label=func_name.strip())
+            plt.plot(convergence_curve, label=func_name)
         else:
-            print(f"Warning: Convergence curve for {func_name.strip()} is empty.")
+            print(f"Warning: Convergence curve for {func_name} is empty.")
 
         # Plot the function surface or contour
-        plot_function(func, lb, ub, dim, optimal_solution, projection=args.projection)
+        plot_function(func, lb, ub, dim, optimal_solution, projection=args.projection, resolution=args.resolution,
+                      cache_dir=None if args.no_grid_cache else args.grid_cache)
 
+    if plt is None:
+        return
     # Ensure there are labeled plots to include in the legend
     if plt.gca().get_legend_handles_labels()[0]:
         plt.xlabel('Iteration')
@@ -0,0 +1,55 @@
+import asyncio
+import inspect
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import SpiderWaspOptimizer
+from sw_optimizer.termination import build_criteria
+
+
+async def evaluate_async(fobj, positions, semaphore, timeout=None):
+    """Оценивает все позиции конкурентно, не более semaphore одновременных вызовов.
+
+    fobj может быть корутинной функцией или обычной (тогда вызов уходит в
+    поток через asyncio.to_thread). Вызов, не уложившийся в timeout секунд,
+    получает значение np.inf и поэтому отбрасывается жадным отбором.
+    """
+    if inspect.iscoroutinefunction(fobj):
+        call = fobj
+    else:
+        def call(x):
+            return asyncio.to_thread(fobj, x)
+
+    async def evaluate_one(x):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(call(x), timeout)
+            except asyncio.TimeoutError:
+                return np.inf
+
+    return np.array(await asyncio.gather(*(evaluate_one(x) for x in positions)), dtype=float)
+
+
+async def swo_async(search_agents_no, Tmax, ub=None, lb=None, dim=None, fobj=None, tol=1e-10, max_stall=300,
+                    seed=None, concurrency=16, timeout=None, recorder=None, reduction='recurrent', max_evals=None,
+                    max_time=None, target_value=None, target_tol=0.0, termination=None):
+    """Асинхронный вариант swo() для целевых функций, ограниченных вводом-выводом.
+
+    Каждая итерация строит всех кандидатов сразу (engine="vectorized") и
+    оценивает их конкурентно: одновременно выполняется не более concurrency
+    вызовов fobj, каждый ограничен timeout секундами (кандидат с истёкшим
+    временем считается отвергнутым). recorder, reduction и критерии
+    остановки (max_evals, max_time, target_value, target_tol, termination) -
+    как в swo().
+    Возвращает тот же кортеж, что и swo().
+    """
+    optimizer = SpiderWaspOptimizer(search_agents_no, Tmax, ub, lb, dim, tol=tol, max_stall=max_stall,
+                                    engine='vectorized', seed=seed, name=fobj.__name__, recorder=recorder,
+                                    reduction=reduction,
+                                    termination=build_criteria(max_evals, max_time, target_value, target_tol,
+                                                               termination))
+    semaphore = asyncio.Semaphore(concurrency)
+    while not optimizer.done:
+        positions = optimizer.ask()
+        optimizer.tell(await evaluate_async(fobj, positions, semaphore, timeout))
+    return optimizer.result()
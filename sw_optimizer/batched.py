@@ -0,0 +1,272 @@
+"""Пакетный режим: R независимых запусков SWO как одни массивы (R, n_agents, dim).
+
+Для статистики нужны десятки независимых запусков на каждую функцию и
+размерность. swo_batch() ведёт их одновременно: позиции всех запусков
+лежат в одном массиве, кандидаты всех запусков строятся одними операциями
+NumPy, а целевая функция вызывается на матрицу (R * n_agents, dim) за
+итерацию. У каждого запуска свой генератор, своя стратегия итерации
+(монета TR), свои перестановки JK, счётчик стагнации и момент остановки;
+остановившиеся запуски убираются из массивов.
+
+Размер популяции по расписанию reduction зависит только от номера
+итерации, поэтому у всех ещё идущих запусков он одинаков. Результат
+запуска зависит только от его собственного генератора: запуск с seed=[s]
+повторяет запуск с тем же s из большого пакета.
+"""
+import numpy as np
+
+from utils.batch import evaluate_population
+from utils.initialization import initialize_positions
+from utils.levy_flight import LevyFlight
+from sw_optimizer.sw_optimizer import REDUCTIONS, SpiderWaspOptimizer, reduced_size
+
+_levy = LevyFlight()
+
+
+def _draw(rngs, shape, normal=False):
+    """Блок случайных чисел (len(rngs), *shape): строка r - из генератора rngs[r]."""
+    out = np.empty((len(rngs),) + shape)
+    for row, rng in zip(out, rngs):
+        if normal:
+            rng.standard_normal(out=row)
+        else:
+            rng.random(out=row)
+    return out
+
+
+def _batch_hunting_candidates(Positions, Best_SW, t, Tmax, lb, ub, rngs):
+    """Стратегия охоты для запусков пакета (как _hunting_candidates, но над (R, n, dim)).
+
+    Каждый генератор выдаёт за итерацию два блока: равномерные числа агента
+    (ключ перестановки JK, r1, r2, r3, p, rl и две строки длины dim) и
+    нормальные (rn1 и две строки для шага Леви). Строки общие для ветвей:
+    агент проходит только одну ветвь и берёт из них то, что ей нужно.
+    """
+    R, n, dim = Positions.shape
+    a = 2 - 2 * (t / Tmax)
+    a2 = -1 - 1 * (t / Tmax)
+    k = 1 - t / Tmax
+
+    U = _draw(rngs, (n, 6 + 2 * dim))
+    N = _draw(rngs, (n, 1 + 2 * dim), normal=True)
+    key, r1, r2, r3, p, rl = np.moveaxis(U[:, :, :6], -1, 0)
+    U1, U2 = U[:, :, 6:6 + dim], U[:, :, 6 + dim:]
+    rn1, N1, N2 = N[:, :, 0], N[:, :, 1:1 + dim], N[:, :, 1 + dim:]
+    C = a * (2 * r1 - 1)
+    l = (a2 - 1) * rl + 1
+
+    runs = np.arange(R)
+    JK = np.argsort(key, axis=1)  # Случайная перестановка агентов каждого запуска
+    P1, P2, P3 = (Positions[runs, JK[:, j]] for j in (1, 2, 3))
+
+    New = Positions.copy()
+    early = np.arange(n) < k * n  # Агенты с различными стратегиями
+    explore = p < (1 - t / Tmax)
+    chase = r1 < r2
+
+    # Охота по принципу "погоня"
+    r, i = np.nonzero(early & explore & chase)
+    if len(r):
+        New[r, i] += (np.abs(rn1[r, i]) * r1[r, i])[:, None] * (P1[r] - P2[r])
+
+    # Взаимодействие с окружающей средой
+    r, i = np.nonzero(early & explore & ~chase)
+    if len(r):
+        B = 1 / (1 + np.exp(l[r, i]))
+        m2 = B * np.cos(l[r, i] * 2 * np.pi)
+        New[r, i] = Positions[r, JK[r, i]] + m2[:, None] * (lb + U1[r, i] * (ub - lb))
+
+    r, i = np.nonzero(early & ~explore & chase)
+    if len(r):
+        New[r, i] += C[r, i, None] * np.abs(2 * U1[r, i] * P3[r] - Positions[r, i])
+
+    r, i = np.nonzero(early & ~explore & ~chase)
+    if len(r):
+        New[r, i] *= U1[r, i] * (2 * k) - k  # Равномерно в [-k, k)
+
+    # Агенты, находящиеся ближе к лучшему решению
+    r, i = np.nonzero(~early & chase)
+    if len(r):
+        New[r, i] = Best_SW[r] + np.cos(2 * l[r, i, None] * np.pi) * (Best_SW[r] - Positions[r, i])
+
+    r, i = np.nonzero(~early & ~chase)
+    if len(r):
+        L = _levy.scale * _levy.sigma * N1[r, i] / np.abs(N2[r, i]) ** (1 / _levy.beta)
+        coin = U1[r, i] > U2[r, i]
+        New[r, i] = (P1[r] + r3[r, i, None] * np.abs(L) * (P1[r] - Positions[r, i])
+                     + (1 - r3[r, i, None]) * coin * (P3[r] - P2[r]))
+
+    return New
+
+
+def _batch_mating_candidates(Positions, SW_Fit, t, Tmax, Cr, rngs):
+    """Стратегия спаривания для запусков пакета (как _mating_candidates, но над (R, n, dim))."""
+    R, n, dim = Positions.shape
+    a2 = -1 - 1 * (t / Tmax)
+
+    U = _draw(rngs, (n, 2 + dim))
+    N = _draw(rngs, (n, 2), normal=True)
+    key, ul, CR = U[:, :, 0], U[:, :, 1], U[:, :, 2:]
+    rn1, rn2 = N[:, :, 0], N[:, :, 1]
+    l = (a2 - 1) * ul + 1
+
+    runs = np.arange(R)
+    JK = np.argsort(key, axis=1)
+    P1, P2, P3 = (Positions[runs, JK[:, j], None] for j in (1, 2, 3))
+    F1, F2, F3 = (SW_Fit[runs, JK[:, j]] for j in (1, 2, 3))
+
+    # Разница между лучшими и текущими агентами
+    sign = np.where(F1[:, None] < SW_Fit, 1.0, -1.0)
+    v1 = sign[:, :, None] * (P1 - Positions)
+    v2 = np.where((F2 < F3)[:, None, None], P2 - P3, P3 - P2)
+
+    SW_m = (Positions + (np.exp(l) * np.abs(rn1))[:, :, None] * v1
+            + ((1 - np.exp(l)) * np.abs(rn2))[:, :, None] * v2)
+    # Применение кроссовера
+    return np.where(CR < Cr, SW_m, Positions)
+
+
+def swo_batch(runs, search_agents_no, Tmax, ub=None, lb=None, dim=None, fobj=None, tol=1e-10, max_stall=300,
+              seed=None, reduction='recurrent', target_value=None, target_tol=0.0, full_output=False):
+    """runs независимых запусков SWO, которые продвигаются вместе.
+
+    Каждая итерация строит кандидатов всех запусков сразу (как
+    engine="vectorized": все агенты запуска обновляются от одного снимка
+    популяции) и оценивает их одним вызовом evaluate_population на матрицу
+    (число идущих запусков * n_agents, dim), поэтому пакетные fobj
+    (utils.batch.batch_objective) получают выигрыш в полной мере.
+
+    seed - int, SeedSequence или None (генераторы запусков - дочерние
+    SeedSequence от него) либо список из runs seed, по одному на запуск.
+    Случайные числа берутся блоками по агенту, поэтому траектории
+    отличаются от swo(engine="vectorized") с тем же seed, но алгоритм тот
+    же. Запуск останавливается по Tmax, max_stall/tol и (если задано)
+    target_value + target_tol; reduction - любое расписание SpiderWaspOptimizer,
+    кроме "legacy".
+
+    Возвращает список из runs кортежей swo(): (Best_score, Best_SW,
+    Convergence_curve, neval, neval_per_function); при full_output=True в
+    каждый добавляется словарь info с причиной остановки stop_reason.
+    """
+    if reduction not in REDUCTIONS or reduction == 'legacy':
+        raise ValueError(f"Unknown reduction {reduction!r} for swo_batch, expected one of "
+                         f"{tuple(r for r in REDUCTIONS if r != 'legacy')}")
+    if np.ndim(seed) == 1:
+        if len(seed) != runs:
+            raise ValueError(f"Expected {runs} seeds, got {len(seed)}")
+        seeds = list(seed)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(runs)
+    if ub is None:
+        ub = 512 * np.ones(dim)
+    if lb is None:
+        lb = -512 * np.ones(dim)
+    ub = np.asarray(ub, dtype=float)
+    lb = np.asarray(lb, dtype=float)
+    TR, Cr = SpiderWaspOptimizer.TR, SpiderWaspOptimizer.Cr
+    N_min = min(SpiderWaspOptimizer.N_min, search_agents_no)
+    threshold = target_value + target_tol if target_value is not None else None
+
+    rngs = [np.random.default_rng(s) for s in seeds]
+    # Стратегии всех итераций: по монете на итерацию из генератора запуска
+    hunting_plan = np.array([rng.random(Tmax) for rng in rngs]).reshape(runs, Tmax) < TR
+
+    # Итоги запусков; пока запуск идёт, его состояние - в строках массивов ниже
+    best_scores = np.full(runs, np.inf)
+    best_positions = np.zeros((runs, dim))
+    curves = np.zeros((runs, Tmax))
+    lengths = np.zeros(runs, dtype=int)
+    neval = np.zeros(runs, dtype=int)
+    stop_reasons = [None] * runs
+
+    # Инициализация позиций агентов и первая оценка
+    n = search_agents_no
+    active = np.arange(runs)  # Идущие запуски (строки массивов состояния)
+    Positions = np.stack([initialize_positions(n, dim, ub, lb, rng) for rng in rngs])
+    SW_Fit = evaluate_population(fobj, Positions.reshape(-1, dim)).reshape(runs, n)
+    neval += n
+    best = np.argmin(SW_Fit, axis=1)
+    Best_score = SW_Fit[active, best]
+    Best_SW = Positions[active, best]
+    prev_best_score = Best_score.copy()
+    stall_count = np.zeros(runs, dtype=int)
+    t = 0
+
+    def finish(done, reasons):
+        """Сохраняет итоги запусков done (маска по active) и убирает их из состояния."""
+        nonlocal active, Positions, SW_Fit, Best_score, Best_SW, prev_best_score, stall_count
+        finished = active[done]
+        best_scores[finished] = Best_score[done]
+        best_positions[finished] = Best_SW[done]
+        lengths[finished] = t
+        for run, reason in zip(finished, reasons[done]):
+            stop_reasons[run] = reason
+        keep = ~done
+        active, Positions, SW_Fit = active[keep], Positions[keep], SW_Fit[keep]
+        Best_score, Best_SW = Best_score[keep], Best_SW[keep]
+        prev_best_score, stall_count = prev_best_score[keep], stall_count[keep]
+
+    if threshold is not None:
+        reached = Best_score <= threshold
+        if reached.any():
+            finish(reached, np.full(len(active), 'target_value', dtype=object))
+
+    while len(active):
+        hunting = hunting_plan[active, t]
+        New = np.empty_like(Positions)
+        h = np.flatnonzero(hunting)
+        if len(h):
+            New[h] = _batch_hunting_candidates(Positions[h], Best_SW[h], t, Tmax, lb, ub,
+                                               [rngs[run] for run in active[h]])
+        m = np.flatnonzero(~hunting)
+        if len(m):
+            New[m] = _batch_mating_candidates(Positions[m], SW_Fit[m], t, Tmax, Cr,
+                                              [rngs[run] for run in active[m]])
+        # Применение границ для всех запусков
+        np.clip(New, lb, ub, out=New)
+
+        fitness = evaluate_population(fobj, New.reshape(-1, dim)).reshape(len(active), n)
+        neval[active] += n
+
+        # Жадный отбор: принимаем только улучшившиеся позиции
+        improved = fitness < SW_Fit
+        Positions = np.where(improved[:, :, None], New, Positions)
+        SW_Fit = np.where(improved, fitness, SW_Fit)
+        rows = np.arange(len(active))
+        best = np.argmin(np.where(improved, fitness, np.inf), axis=1)
+        better = fitness[rows, best] < Best_score
+        Best_score = np.where(better, fitness[rows, best], Best_score)
+        Best_SW = np.where(better[:, None], New[rows, best], Best_SW)
+
+        # Обновление сходимости и проверка на стагнацию
+        t += 1
+        curves[active, t - 1] = Best_score
+        stall_count = np.where(np.abs(prev_best_score - Best_score) < tol, stall_count + 1, 0)
+        prev_best_score = Best_score.copy()
+
+        # Адаптивное уменьшение количества агентов, одинаковое для всех запусков
+        size = reduced_size(reduction, n, search_agents_no, N_min, t, Tmax)
+        if size < n:
+            keep = np.sort(np.argsort(SW_Fit, axis=1, kind='stable')[:, :size], axis=1)
+            Positions = np.take_along_axis(Positions, keep[:, :, None], axis=1)
+            SW_Fit = np.take_along_axis(SW_Fit, keep, axis=1)
+            n = size
+
+        # Критерии в порядке SpiderWaspOptimizer: Tmax, стагнация, цель
+        reasons = np.full(len(active), None, dtype=object)
+        if threshold is not None:
+            reasons[Best_score <= threshold] = 'target_value'
+        if max_stall is not None:
+            reasons[stall_count >= max_stall] = 'stall'
+        if t >= Tmax:
+            reasons[:] = 'max_iterations'
+        done = np.array([reason is not None for reason in reasons], dtype=bool)
+        if done.any():
+            finish(done, reasons)
+
+    results = []
+    for run in range(runs):
+        result = (best_scores[run], best_positions[run], curves[run, :lengths[run]], int(neval[run]),
+                  {fobj.__name__: int(neval[run])})
+        results.append(result + ({'stop_reason': stop_reasons[run]},) if full_output else result)
+    return results
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class EvaluationCache:
+    """Ограниченный LRU-кэш значений целевой функции по позициям.
+
+    Ключ - байты позиции, точные или округлённые до decimals знаков
+    (decimals=None). Счётчики hits/misses считают попадания и промахи.
+    """
+
+    def __init__(self, maxsize, decimals=None):
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def _key(self, x):
+        if self.decimals is not None:
+            x = np.round(x, self.decimals) + 0.0  # + 0.0 сводит -0.0 к 0.0
+        return x.tobytes()
+
+    def lookup(self, positions):
+        """Возвращает (fitness, miss): известные значения и маску позиций, которых нет в кэше."""
+        fitness = np.full(len(positions), np.nan)
+        miss = np.ones(len(positions), dtype=bool)
+        for i, x in enumerate(positions):
+            key = self._key(x)
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                fitness[i] = value
+                miss[i] = False
+        hits = len(positions) - int(miss.sum())
+        self.hits += hits
+        self.misses += len(positions) - hits
+        return fitness, miss
+
+    def store(self, positions, fitness):
+        for x, value in zip(positions, fitness):
+            self._data[self._key(x)] = float(value)
+            self._data.move_to_end(self._key(x))
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def state(self):
+        """Ключи (матрица байтов, от самого давнего к самому свежему), значения и счётчики - для контрольной точки."""
+        if self._data:
+            keys = np.frombuffer(b''.join(self._data), dtype=np.uint8).reshape(len(self._data), -1)
+        else:
+            keys = np.empty((0, 0), dtype=np.uint8)
+        return keys, np.fromiter(self._data.values(), dtype=float, count=len(self._data)), self.hits, self.misses
+
+    def load_state(self, keys, values, hits, misses):
+        """Восстанавливает содержимое и счётчики, сохранённые state()."""
+        self._data = OrderedDict((key.tobytes(), float(value)) for key, value in zip(keys, values))
+        self.hits = hits
+        self.misses = misses
@@ -0,0 +1,44 @@
+import json
+import os
+
+import numpy as np
+
+# Массивы и скаляры состояния swo(), сохраняемые в контрольной точке
+ARRAY_FIELDS = ('Positions', 'SW_Fit', 'Best_SW', 'Convergence_curve')
+SCALAR_FIELDS = ('Best_score', 'prev_best_score', 't', 'stall_count', 'search_agents_no', 'neval', 'Tmax', 'dim')
+# Состояние кэша оценок и суррогатной модели: сохраняется, только если есть в state
+OPTIONAL_FIELDS = ('cache_keys', 'cache_values', 'cache_hits', 'cache_misses', 'surrogate_X', 'surrogate_y',
+                   'screened_out')
+
+
+def save_checkpoint(path, state, rng):
+    """Атомарно записывает состояние запуска и генератора rng в .npz.
+
+    Файл сначала пишется рядом под временным именем и затем заменяет
+    старый, поэтому прерывание во время записи не портит прежнюю точку.
+    """
+    arrays = {name: np.asarray(state[name]) for name in ARRAY_FIELDS}
+    arrays.update({name: np.asarray(state[name]) for name in SCALAR_FIELDS})
+    arrays.update({name: np.asarray(state[name]) for name in OPTIONAL_FIELDS if name in state})
+    arrays['neval_per_function'] = np.array(json.dumps(state['neval_per_function']))
+    arrays['rng_state'] = np.array(json.dumps(rng.bit_generator.state))
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """Читает контрольную точку; возвращает (state, rng) с восстановленным генератором."""
+    with np.load(path) as data:
+        state = {name: data[name].copy() for name in ARRAY_FIELDS}
+        state.update({name: data[name].item() for name in SCALAR_FIELDS})
+        state.update({name: data[name].copy() if data[name].ndim else data[name].item()
+                      for name in OPTIONAL_FIELDS if name in data})
+        state['neval_per_function'] = json.loads(data['neval_per_function'].item())
+        rng_state = json.loads(data['rng_state'].item())
+
+    bit_generator = getattr(np.random, rng_state['bit_generator'])()
+    bit_generator.state = rng_state
+    return state, np.random.Generator(bit_generator)
@@ -0,0 +1,330 @@
+"""Распределённая оценка: координатор раздаёт кандидатов работникам на любых хостах по TCP.
+
+Координатор (Coordinator) слушает адрес, работники подключаются к нему
+(python -m sw_optimizer.distributed --connect host:port --authkey KEY),
+получают целевую функцию и куски популяции, оценивают их и возвращают
+значения. Соединения - multiprocessing.connection с проверкой authkey
+(HMAC), поэтому сообщения, разбираемые pickle, принимаются только от
+знающих ключ. Целевая функция передаётся pickle, то есть по ссылке на
+модуль: он должен импортироваться на каждом работнике.
+
+Работник, соединение с которым оборвалось или который не вернул кусок за
+task_timeout секунд, отключается, а его кусок отдаётся другому. Работники
+могут подключаться в любой момент, в том числе посреди итерации.
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing.connection import Client, Listener, wait
+
+import numpy as np
+
+from utils.batch import evaluate_population
+
+
+class _Worker:
+    """Подключённый работник и его счётчики."""
+
+    def __init__(self, conn, name):
+        self.conn = conn
+        self.name = name
+        self.fobj = None  # Целевая функция, уже переданная работнику
+        self.task = None  # (вызов, start, stop) куска в работе
+        self.task_id = None
+        self.sent_at = None
+        self.alive = True
+        self.tasks = 0
+        self.evaluations = 0
+        self.busy = 0.0  # Время оценки на работнике, с
+        self.wall = 0.0  # Время от отправки куска до ответа, с
+        self.failures = 0  # Куски, отданные другим после сбоя этого работника
+
+
+class Coordinator:
+    """Раздаёт оценку популяции подключённым по TCP работникам.
+
+    address - (host, port) для прослушивания (port=0 - свободный порт;
+    фактический адрес - в self.address). authkey - общий секрет с
+    работниками; по умолчанию генерируется случайный (self.authkey).
+    chunk_size - строк популяции в одном куске (по умолчанию популяция
+    делится на два куска на работника, чтобы быстрые работники брали
+    больше). task_timeout - секунд на кусок, после которых работник
+    считается зависшим; worker_timeout - сколько ждать, пока не подключится
+    хотя бы один работник, прежде чем evaluate() выбросит RuntimeError
+    (None - ждать сколько угодно).
+    """
+
+    def __init__(self, address=('127.0.0.1', 0), authkey=None, chunk_size=None, task_timeout=None,
+                 worker_timeout=None):
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        self.chunk_size = chunk_size
+        self.task_timeout = task_timeout
+        self.worker_timeout = worker_timeout
+        # С очередью по умолчанию (1) одновременно стартующие работники теряют подключения
+        self.listener = Listener(address, backlog=64, authkey=self.authkey)
+        self.address = self.listener.address
+        self.workers = []
+        self._joined = deque()  # Подключившиеся, но ещё не взятые в работу
+        self._connected = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._calls = 0
+        self._task_ids = 0
+        self._accept_thread = threading.Thread(target=self._accept, daemon=True)
+        self._accept_thread.start()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue  # Неверный authkey или оборванное подключение
+            if self._closed:
+                conn.close()
+                return
+            try:
+                if not conn.poll(10.0):
+                    raise EOFError
+                kind, name = conn.recv()
+                if kind != 'hello':
+                    raise EOFError
+            except (EOFError, OSError, ValueError, pickle.UnpicklingError):
+                conn.close()
+                continue
+            with self._lock:
+                self._joined.append(_Worker(conn, name))
+            self._connected.set()
+
+    def _adopt(self):
+        with self._lock:
+            while self._joined:
+                self.workers.append(self._joined.popleft())
+            self._connected.clear()
+
+    def _drop(self, worker, pending):
+        """Отключает работника; его кусок текущего вызова возвращается в очередь."""
+        worker.alive = False
+        worker.conn.close()
+        if worker.task is not None and worker.task[0] == self._calls:
+            pending.appendleft(worker.task)
+            worker.failures += 1
+        worker.task = None
+
+    def _send(self, worker, fobj, positions, task, pending):
+        try:
+            if worker.fobj is not fobj:
+                worker.conn.send(('setup', pickle.dumps(fobj)))
+                worker.fobj = fobj
+            self._task_ids += 1
+            worker.conn.send(('task', self._task_ids, positions[task[1]:task[2]]))
+        except (OSError, ValueError):
+            pending.appendleft(task)
+            self._drop(worker, pending)
+            return
+        worker.task, worker.task_id, worker.sent_at = task, self._task_ids, time.perf_counter()
+
+    def evaluate(self, fobj, positions):
+        """Значения fobj для строк positions, посчитанные работниками."""
+        positions = np.ascontiguousarray(positions, dtype=np.float64)
+        n = len(positions)
+        fitness = np.empty(n)
+        self._calls += 1
+        call = self._calls
+        self._adopt()
+        alive = [w for w in self.workers if w.alive]
+        size = self.chunk_size or max(1, math.ceil(n / (2 * max(1, len(alive)))))
+        pending = deque((call, start, min(start + size, n)) for start in range(0, n, size))
+        remaining = len(pending)
+        waiting_since = time.monotonic()
+
+        while remaining:
+            self._adopt()
+            alive = [w for w in self.workers if w.alive]
+            for worker in alive:
+                if not pending:
+                    break
+                if worker.task is None:
+                    self._send(worker, fobj, positions, pending.popleft(), pending)
+
+            busy = [w for w in alive if w.alive and w.task is not None]
+            if not busy:
+                # Нет ни одного работника: ждём подключения
+                if self.worker_timeout is not None and time.monotonic() - waiting_since > self.worker_timeout:
+                    raise RuntimeError(f"No workers connected to {self.address} within {self.worker_timeout} s")
+                self._connected.wait(0.1)
+                continue
+            waiting_since = time.monotonic()
+
+            by_conn = {w.conn: w for w in busy}
+            for conn in wait(list(by_conn), timeout=0.1):
+                worker = by_conn[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    self._drop(worker, pending)
+                    continue
+                kind, task_id = message[0], message[1]
+                if task_id != worker.task_id:
+                    continue  # Ответ на кусок, от которого уже отказались
+                task, worker.task = worker.task, None
+                if task[0] != call:
+                    continue  # Кусок вызова, прерванного исключением
+                if kind == 'error':
+                    raise RuntimeError(f"Worker {worker.name} failed:\n{message[2]}")
+                _, start, stop = task
+                fitness[start:stop] = message[2]
+                remaining -= 1
+                worker.tasks += 1
+                worker.evaluations += stop - start
+                worker.busy += message[3]
+                worker.wall += time.perf_counter() - worker.sent_at
+
+            if self.task_timeout is not None:
+                now = time.perf_counter()
+                for worker in busy:
+                    if worker.alive and worker.task is not None and now - worker.sent_at > self.task_timeout:
+                        self._drop(worker, pending)
+        return fitness
+
+    def stats(self):
+        """Счётчики по работникам: куски, оценки, время и пропускная способность (оценок в секунду)."""
+        self._adopt()
+        return [{
+            'name': w.name,
+            'alive': w.alive,
+            'tasks': w.tasks,
+            'evaluations': w.evaluations,
+            'busy': w.busy,
+            'wall': w.wall,
+            'failures': w.failures,
+            'evals_per_second': w.evaluations / w.busy if w.busy > 0 else None,
+        } for w in self.workers]
+
+    def close(self):
+        """Отправляет работникам stop и закрывает соединения и прослушивание."""
+        self._closed = True
+        self._adopt()
+        for worker in self.workers:
+            if worker.alive:
+                try:
+                    worker.conn.send(('stop',))
+                except OSError:
+                    pass
+                worker.conn.close()
+                worker.alive = False
+        # accept() не прерывается закрытием сокета, поэтому будим его пустым подключением
+        try:
+            socket.create_connection(self.address, timeout=1.0).close()
+        except OSError:
+            pass
+        self._accept_thread.join(timeout=1.0)
+        self.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DistributedEvaluator:
+    """Пакетная целевая функция (utils.batch), которая оценивает fobj через координатор.
+
+    Имеет тот же __name__, что и fobj, поэтому её можно передать в swo()
+    или SpiderWaspOptimizer.iterate() вместо fobj.
+    """
+
+    batch = True
+
+    def __init__(self, fobj, coordinator):
+        self.fobj = fobj
+        self.coordinator = coordinator
+        self.__name__ = fobj.__name__
+
+    def __call__(self, positions):
+        return self.coordinator.evaluate(self.fobj, np.atleast_2d(positions))
+
+
+def run_worker(address, authkey, name=None, connect_timeout=30.0):
+    """Цикл работника: подключается к координатору и оценивает присланные куски.
+
+    Повторяет попытки подключения до connect_timeout секунд (координатор
+    может запуститься позже). Завершается, когда координатор закрывает
+    соединение или присылает stop.
+    """
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except (ConnectionRefusedError, OSError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+    fobj, setup_error = None, None
+    with conn:
+        conn.send(('hello', name or f'{socket.gethostname()}:{os.getpid()}'))
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            kind = message[0]
+            if kind == 'stop':
+                return
+            if kind == 'setup':
+                # Функция приходит байтами, чтобы ошибка импорта её модуля не роняла работника
+                try:
+                    fobj, setup_error = pickle.loads(message[1]), None
+                except Exception:
+                    fobj, setup_error = None, traceback.format_exc()
+                continue
+            task_id, positions = message[1], message[2]
+            if setup_error is not None:
+                conn.send(('error', task_id, setup_error))
+                continue
+            start = time.perf_counter()
+            try:
+                fitness = evaluate_population(fobj, positions)
+            except Exception:
+                conn.send(('error', task_id, traceback.format_exc()))
+                continue
+            conn.send(('result', task_id, fitness, time.perf_counter() - start))
+
+
+def start_local_workers(coordinator, n, context=None):
+    """Запускает n работников-процессов на этой машине (для проверки и бенчмарков)."""
+    context = context or multiprocessing.get_context()
+    processes = []
+    for _ in range(n):
+        process = context.Process(target=run_worker, args=(coordinator.address, coordinator.authkey), daemon=True)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SWO evaluation worker: connects to a coordinator and evaluates '
+                                                 'the candidates it sends.')
+    parser.add_argument('--connect', type=str, required=True, help='Coordinator address, host:port')
+    parser.add_argument('--authkey', type=str, required=True, help="Coordinator's authkey as hex")
+    parser.add_argument('--name', type=str, default=None, help='Worker name in the statistics (default host:pid)')
+    parser.add_argument('--connect-timeout', type=float, default=30.0,
+                        help='Seconds to keep retrying while the coordinator is not up yet')
+    args = parser.parse_args()
+    host, port = args.connect.rsplit(':', 1)
+    run_worker((host, int(port)), bytes.fromhex(args.authkey), args.name, args.connect_timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+import multiprocessing
+import queue
+import traceback
+
+import numpy as np
+
+from sw_optimizer.sw_optimizer import SpiderWaspOptimizer
+from sw_optimizer.termination import build_criteria
+
+TOPOLOGIES = ('ring', 'full')
+
+
+def neighbours(index, islands, topology):
+    """Острова, которые отправляют мигрантов острову index."""
+    if topology == 'ring':
+        return [(index - 1) % islands] if islands > 1 else []
+    return [j for j in range(islands) if j != index]
+
+
+def _run_island(index, seed, args, options, migration_interval, migrants, inbox, outbox):
+    """Тело процесса-острова: обычный запуск SWO с обменом агентами каждые migration_interval итераций."""
+    try:
+        search_agents_no, Tmax, ub, lb, dim, fobj = args
+        termination = build_criteria(options.pop('max_evals'), options.pop('max_time'),
+                                     options.pop('target_value'), options.pop('target_tol'))
+        optimizer = SpiderWaspOptimizer(search_agents_no, Tmax, ub, lb, dim, seed=seed, name=fobj.__name__,
+                                        termination=termination, **options)
+        migrated = optimizer.t // migration_interval  # Раунды миграции, которые уже пройдены
+        for state in optimizer.iterate(fobj):
+            # Миграция, когда t перешло через очередное кратное migration_interval
+            if optimizer.done or state.t // migration_interval <= migrated:
+                continue
+            migrated = state.t // migration_interval
+            outbox.put(('migrants', index, optimizer.emigrants(migrants)))
+            positions, fitness = inbox.get()
+            if len(fitness):
+                optimizer.immigrate(positions, fitness)
+        outbox.put(('result', index, optimizer.result() + (optimizer.stop_reason,)))
+    except Exception:
+        outbox.put(('error', index, traceback.format_exc()))
+
+
+def swo_islands(search_agents_no, Tmax, ub=None, lb=None, dim=None, fobj=None, tol=1e-10, max_stall=300,
+                engine='loop', islands=4, migration_interval=25, migrants=1, topology='ring', seed=None,
+                reduction='recurrent', cache_size=None, cache_decimals=None, max_evals=None, max_time=None,
+                target_value=None, target_tol=0.0, full_output=False, mp_context=None):
+    """Островная модель SWO: islands независимых популяций в отдельных процессах.
+
+    Каждый остров - обычный запуск SpiderWaspOptimizer с search_agents_no
+    агентами и собственным генератором (дочерние SeedSequence от seed).
+    Каждые migration_interval итераций острова синхронно обмениваются
+    migrants лучшими агентами: при topology="ring" остров i получает
+    мигрантов от острова i - 1, при topology="full" - от всех остальных.
+    Пришельцы заменяют худших агентов, если они лучше; повторно они не
+    оцениваются. Остров, закончивший раньше других (например, по max_stall),
+    продолжает отдавать соседям свой итоговый лучший результат.
+
+    Параметры tol, max_stall, engine, reduction, кэш и критерии остановки
+    (max_evals, max_time, target_value, target_tol) действуют на каждый
+    остров отдельно; fobj должна сериализоваться pickle.
+
+    Возвращает кортеж swo(): лучшую оценку и позицию по всем островам,
+    кривую сходимости (поитерационный минимум по островам), суммарные neval
+    и neval_per_function. При full_output=True добавляется словарь info со
+    списками best_scores, neval и stop_reasons по островам.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+    if migration_interval < 1:
+        raise ValueError("migration_interval must be at least 1")
+
+    context = mp_context or multiprocessing.get_context()
+    seeds = np.random.SeedSequence(seed).spawn(islands)
+    args = (search_agents_no, Tmax, ub, lb, dim, fobj)
+    outbox = context.Queue()
+    inboxes = [context.Queue() for _ in range(islands)]
+    processes = []
+    for index in range(islands):
+        options = {'tol': tol, 'max_stall': max_stall, 'engine': engine, 'reduction': reduction,
+                   'cache_size': cache_size, 'cache_decimals': cache_decimals, 'max_evals': max_evals,
+                   'max_time': max_time, 'target_value': target_value, 'target_tol': target_tol}
+        process = context.Process(target=_run_island, daemon=True,
+                                  args=(index, seeds[index], args, options, migration_interval, migrants,
+                                        inboxes[index], outbox))
+        process.start()
+        processes.append(process)
+
+    latest = [None] * islands  # Последние мигранты (или итоговый лучший) каждого острова
+    results = [None] * islands
+    try:
+        active = set(range(islands))
+        while active:
+            # Раунд миграции: от каждого работающего острова ровно одно сообщение
+            waiting = set()
+            for _ in range(len(active)):
+                kind, index, payload = _receive(outbox, processes, active)
+                if kind == 'error':
+                    raise RuntimeError(f"Island {index} failed:\n{payload}")
+                if kind == 'result':
+                    results[index] = payload
+                    latest[index] = (payload[1][None, :], np.array([payload[0]]))
+                    active.discard(index)
+                else:
+                    latest[index] = payload
+                    waiting.add(index)
+            for index in waiting:
+                incoming = [latest[j] for j in neighbours(index, islands, topology) if latest[j] is not None]
+                if incoming:
+                    inboxes[index].put((np.vstack([p for p, _ in incoming]),
+                                        np.concatenate([f for _, f in incoming])))
+                else:
+                    inboxes[index].put((np.empty((0, dim)), np.empty(0)))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    best = min(range(islands), key=lambda i: results[i][0])
+    length = max(len(r[2]) for r in results)
+    curves = np.array([np.pad(r[2], (0, length - len(r[2])), mode='edge') if len(r[2]) else np.full(length, r[0])
+                       for r in results])
+    neval_per_function = {}
+    for r in results:
+        for name, count in r[4].items():
+            neval_per_function[name] = neval_per_function.get(name, 0) + count
+    result = (results[best][0], results[best][1], curves.min(axis=0), sum(r[3] for r in results),
+              neval_per_function)
+    if full_output:
+        info = {
+            'best_scores': [float(r[0]) for r in results],
+            'neval': [r[3] for r in results],
+            'stop_reasons': [r[5] for r in results],
+        }
+        return result + (info,)
+    return result
+
+
+def _receive(outbox, processes, active):
+    # Ждём сообщение, проверяя, что работающие острова не завершились аварийно
+    while True:
+        try:
+            return outbox.get(timeout=1.0)
+        except queue.Empty:
+            for index in active:
+                if not processes[index].is_alive() and processes[index].exitcode != 0:
+                    raise RuntimeError(f"Island {index} exited with code {processes[index].exitcode}")
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.batch import evaluate_population
+
+# Разделяемые буферы, уже подключённые в процессе-работнике (по имени блока)
+_attached = {}
+_MAX_ATTACHED = 8
+
+
+def _attach(name):
+    shm = _attached.get(name)
+    if shm is None:
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python < 3.13; работники пула делят resource_tracker с родителем
+            shm = shared_memory.SharedMemory(name=name)
+        if len(_attached) >= _MAX_ATTACHED:
+            _attached.pop(next(iter(_attached))).close()
+        _attached[name] = shm
+    return shm
+
+
+def _evaluate_chunk(fobj, positions_name, fitness_name, n, dim, start, stop):
+    """Оценивает строки start:stop популяции прямо в разделяемой памяти."""
+    positions = np.ndarray((n, dim), dtype=np.float64, buffer=_attach(positions_name).buf)
+    fitness = np.ndarray((n,), dtype=np.float64, buffer=_attach(fitness_name).buf)
+    fitness[start:stop] = evaluate_population(fobj, positions[start:stop])
+
+
+class SharedMemoryEvaluator:
+    """Параллельная оценка популяции в пуле процессов concurrent.futures.
+
+    Позиции кандидатов и значения fitness передаются через
+    multiprocessing.shared_memory: работникам пересылаются только имена
+    буферов и диапазоны строк, а не сами массивы. Пул можно передать
+    готовым (executor), иначе создаётся собственный ProcessPoolExecutor
+    с max_workers процессами, который закрывается в close().
+
+    Сам оценщик является пакетной целевой функцией (utils.batch) с тем же
+    __name__, что и fobj, поэтому его можно передать в swo() вместо fobj.
+    """
+
+    batch = True
+
+    def __init__(self, fobj, max_agents, dim, executor=None, max_workers=None):
+        self.fobj = fobj
+        self.__name__ = fobj.__name__
+        self.max_agents = max_agents
+        self.dim = dim
+        self._owns_executor = executor is None
+        self.executor = executor if executor is not None else ProcessPoolExecutor(max_workers)
+        self.n_chunks = max_workers or getattr(self.executor, '_max_workers', None) or os.cpu_count() or 1
+
+        self._positions_shm = shared_memory.SharedMemory(create=True, size=max_agents * dim * 8)
+        self._fitness_shm = shared_memory.SharedMemory(create=True, size=max_agents * 8)
+        self.positions = np.ndarray((max_agents, dim), dtype=np.float64, buffer=self._positions_shm.buf)
+        self.fitness = np.ndarray((max_agents,), dtype=np.float64, buffer=self._fitness_shm.buf)
+
+    def __call__(self, positions):
+        n = len(positions)
+        if n > self.max_agents:
+            raise ValueError(f"Population of {n} agents exceeds the buffer size {self.max_agents}")
+        self.positions[:n] = positions
+
+        bounds = np.linspace(0, n, min(self.n_chunks, n) + 1).astype(int)
+        futures = [
+            self.executor.submit(_evaluate_chunk, self.fobj, self._positions_shm.name, self._fitness_shm.name,
+                                 self.max_agents, self.dim, start, stop)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()  # Пробрасываем исключения из работников
+        return self.fitness[:n].copy()
+
+    def close(self):
+        if self._owns_executor:
+            self.executor.shutdown()
+        # Освобождаем ссылки на буфер, иначе SharedMemory.close() выдаст BufferError
+        self.positions = self.fitness = None
+        for shm in (self._positions_shm, self._fitness_shm):
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class RBFSurrogate:
+    """Архив оценённых точек и кубическая RBF-модель с линейным хвостом над ним.
+
+    Архив хранит каждую пару (позиция, оценка), переданную в add()
+    (archive_size ограничивает его последними точками). Модель строится по
+    последним points точкам архива (по умолчанию max(200, 2 (dim + 1))) в
+    координатах, нормированных на [lb, ub], и перестраивается лениво - при
+    первом predict() после новых оценок. Оценки выше медианы обучающего
+    набора заменяются медианой, чтобы огромные значения вдали от оптимума
+    не портили модель вблизи него.
+    """
+
+    smoothing = 1e-8  # Регуляризация системы (повторяющиеся точки делают её вырожденной)
+
+    def __init__(self, lb, ub, points=None, archive_size=None):
+        self.lb = np.asarray(lb, dtype=float)
+        self.dim = len(self.lb)
+        self.scale = np.asarray(ub, dtype=float) - self.lb
+        self.scale[self.scale == 0] = 1.0
+        self.points = points or max(200, 2 * (self.dim + 1))
+        self.archive_size = archive_size
+        self._X = np.empty((0, self.dim))
+        self._y = np.empty(0)
+        self._size = 0
+        self._model = None
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def ready(self):
+        # Линейному хвосту нужно хотя бы dim + 2 точки
+        return self._size >= self.dim + 2
+
+    def add(self, positions, fitness):
+        """Добавляет оценённые точки в архив (бесконечные и nan-оценки пропускаются)."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, self.dim)
+        fitness = np.asarray(fitness, dtype=float).reshape(len(positions))
+        finite = np.isfinite(fitness)
+        positions, fitness = positions[finite], fitness[finite]
+        if not len(fitness):
+            return
+        if self._size + len(fitness) > len(self._y):
+            # Массивы архива растут удвоением
+            capacity = max(2 * len(self._y), self._size + len(fitness), 64)
+            self._X = np.resize(self._X, (capacity, self.dim))
+            self._y = np.resize(self._y, capacity)
+        self._X[self._size:self._size + len(fitness)] = (positions - self.lb) / self.scale
+        self._y[self._size:self._size + len(fitness)] = fitness
+        self._size += len(fitness)
+        if self.archive_size is not None and self._size > self.archive_size:
+            drop = self._size - self.archive_size
+            self._X[:self.archive_size] = self._X[drop:self._size]
+            self._y[:self.archive_size] = self._y[drop:self._size]
+            self._size = self.archive_size
+        self._model = None
+
+    def archive(self):
+        """Позиции и оценки архива (копии)."""
+        return self._X[:self._size] * self.scale + self.lb, self._y[:self._size].copy()
+
+    def state(self):
+        """Архив в нормированных координатах (для контрольной точки: без потерь на пересчёте)."""
+        return self._X[:self._size].copy(), self._y[:self._size].copy()
+
+    def load_state(self, X, y):
+        """Заменяет архив сохранённым state()."""
+        self._X = np.array(X, dtype=float).reshape(-1, self.dim)
+        self._y = np.array(y, dtype=float).reshape(len(self._X))
+        self._size = len(self._y)
+        self._model = None
+
+    def _fit(self):
+        start = max(0, self._size - self.points)
+        centers, y = self._X[start:self._size], self._y[start:self._size]
+        m = len(y)
+        y = np.minimum(y, np.median(y))
+        shift, spread = y.mean(), y.std() or 1.0
+        A = np.zeros((m + self.dim + 1, m + self.dim + 1))
+        A[:m, :m] = _distances(centers, centers) ** 3
+        A[:m, :m][np.diag_indices(m)] += self.smoothing
+        A[:m, m] = A[m, :m] = 1.0
+        A[:m, m + 1:] = centers
+        A[m + 1:, :m] = centers.T
+        b = np.zeros(len(A))
+        b[:m] = (y - shift) / spread
+        try:
+            coef = np.linalg.solve(A, b)
+        except np.linalg.LinAlgError:
+            coef = np.linalg.lstsq(A, b, rcond=None)[0]
+        self._model = (centers, coef[:m], coef[m], coef[m + 1:], shift, spread)
+
+    def predict(self, positions):
+        """Предсказанные оценки для матрицы позиций (n, dim)."""
+        if not self.ready:
+            raise RuntimeError(f"The surrogate needs at least {self.dim + 2} evaluated points, has {self._size}")
+        if self._model is None:
+            self._fit()
+        centers, weights, c0, c1, shift, spread = self._model
+        u = (np.asarray(positions, dtype=float).reshape(-1, self.dim) - self.lb) / self.scale
+        s = _distances(u, centers) ** 3 @ weights + c0 + u @ c1
+        return s * spread + shift
+
+
+def _distances(A, B):
+    # Евклидовы расстояния между строками A и B через скалярные произведения
+    d2 = np.sum(A ** 2, axis=1)[:, None] + np.sum(B ** 2, axis=1)[None, :] - 2 * A @ B.T
+    return np.sqrt(np.maximum(d2, 0.0, out=d2))
@@ -1,146 +1,901 @@
+import time
+from collections import namedtuple
+
 import numpy as np
 from utils.initialization import initialize_positions
 from utils.levy_flight import levy_flight
+from utils.batch import evaluate_population
+from sw_optimizer.cache import EvaluationCache
+from sw_optimizer.surrogate import RBFSurrogate
+from sw_optimizer.telemetry import PHASES, TimedGenerator
+from sw_optimizer.termination import MaxEvaluations, MaxIterations, Stall, build_criteria
+
+ENGINES = ('loop', 'vectorized')
+REDUCTIONS = ('recurrent', 'linear', 'nonlinear', 'off', 'legacy')
+
+# Состояние, которое SpiderWaspOptimizer.iterate() выдаёт после каждой итерации
+IterationState = namedtuple('IterationState', 't best_score best_position neval search_agents_no hunting')
+
+
+def reduced_size(reduction, search_agents_no, N_init, N_min, t, Tmax):
+    """Размер популяции после итерации t по расписанию reduction (см. SpiderWaspOptimizer)."""
+    if reduction in ('recurrent', 'legacy'):
+        return max(N_min, int(N_min + (search_agents_no - N_min) * ((Tmax - t) / Tmax)))
+    if reduction == 'linear':
+        return round(N_init + (N_min - N_init) * t / Tmax)
+    if reduction == 'nonlinear':
+        return round(N_init + (N_min - N_init) * (t / Tmax) ** (1 - t / Tmax))
+    return search_agents_no
+
+
+def _hunting_candidates(Positions, Best_SW, JK, t, Tmax, lb, ub, rng):
+    """Стратегия охоты для всей популяции сразу (engine="vectorized").
+
+    Все агенты обновляются от одного и того же снимка популяции, ветви
+    выбираются булевыми масками вместо вложенных циклов по i и j.
+    """
+    n, dim = Positions.shape
+    a = 2 - 2 * (t / Tmax)
+    a2 = -1 - 1 * (t / Tmax)
+    k = 1 - t / Tmax
+
+    r1, r2, r3, p, rl = rng.random((5, n))
+    C = a * (2 * r1 - 1)
+    l = (a2 - 1) * rl + 1
+    rn1 = rng.standard_normal(n)
+
+    New = Positions.copy()
+    early = np.arange(n) < k * n  # Агенты с различными стратегиями
+    explore = p < (1 - t / Tmax)
+    chase = r1 < r2
+
+    # Охота по принципу "погоня"
+    mask = early & explore & chase
+    if mask.any():
+        m1 = np.abs(rn1[mask]) * r1[mask]
+        New[mask] += m1[:, None] * (Positions[JK[1]] - Positions[JK[2]])
+
+    # Взаимодействие с окружающей средой
+    mask = early & explore & ~chase
+    if mask.any():
+        B = 1 / (1 + np.exp(l[mask]))
+        m2 = B * np.cos(l[mask] * 2 * np.pi)
+        R = rng.random((mask.sum(), dim))
+        New[mask] = Positions[JK[mask]] + m2[:, None] * (lb + R * (ub - lb))
+
+    mask = early & ~explore & chase
+    if mask.any():
+        R = rng.random((mask.sum(), dim))
+        New[mask] += C[mask, None] * np.abs(2 * R * Positions[JK[3]] - Positions[mask])
+
+    mask = early & ~explore & ~chase
+    if mask.any():
+        vc = rng.uniform(-k, k, (mask.sum(), dim))
+        New[mask] *= vc
+
+    # Агенты, находящиеся ближе к лучшему решению
+    mask = ~early & chase
+    if mask.any():
+        New[mask] = Best_SW + np.cos(2 * l[mask, None] * np.pi) * (Best_SW - Positions[mask])
+
+    mask = ~early & ~chase
+    if mask.any():
+        cnt = mask.sum()
+        L = levy_flight((cnt, dim), rng)
+        coin = rng.random((cnt, dim)) > rng.random((cnt, dim))
+        New[mask] = (Positions[JK[1]] + r3[mask, None] * np.abs(L) * (Positions[JK[1]] - Positions[mask])
+                     + (1 - r3[mask, None]) * coin * (Positions[JK[3]] - Positions[JK[2]]))
+
+    return New
+
+
+def _mating_candidates(Positions, SW_Fit, JK, t, Tmax, Cr, rng):
+    """Стратегия спаривания для всей популяции сразу (engine="vectorized")."""
+    n, dim = Positions.shape
+    a2 = -1 - 1 * (t / Tmax)
+
+    l = (a2 - 1) * rng.random(n) + 1
+    rn1, rn2 = rng.standard_normal((2, n))
+
+    # Разница между лучшими и текущими агентами
+    sign = np.where(SW_Fit[JK[1]] < SW_Fit, 1.0, -1.0)
+    v1 = sign[:, None] * (Positions[JK[1]] - Positions)
+    v2 = Positions[JK[2]] - Positions[JK[3]] if SW_Fit[JK[2]] < SW_Fit[JK[3]] else Positions[JK[3]] - Positions[JK[2]]
+
+    SW_m = (Positions + (np.exp(l) * np.abs(rn1))[:, None] * v1
+            + ((1 - np.exp(l)) * np.abs(rn2))[:, None] * v2)
+    # Применение кроссовера
+    cross = rng.random((n, dim)) < Cr
+    return np.where(cross, SW_m, Positions)
+
+
+class SpiderWaspOptimizer:
+    """Spider Wasp Optimizer в пошаговой форме ask/tell.
+
+    ask() возвращает матрицу позиций-кандидатов, которые нужно оценить,
+    tell(fitness) принимает их значения и применяет жадный отбор, обновление
+    Best_SW и уменьшение популяции. Первый ask() возвращает начальную
+    популяцию. Цикл оценки остаётся у вызывающего кода, поэтому кандидатов
+    можно отдавать внешнему планировщику; iterate(fobj) - готовый цикл,
+    выдающий IterationState после каждой итерации.
+
+    engine="vectorized" выдаёт всех кандидатов итерации одним ask() (все
+    агенты обновляются от одного снимка популяции). engine="loop" выдаёт
+    кандидатов по одному агенту (матрица (1, dim)), и каждый следующий
+    агент видит уже принятый ход предыдущего.
+
+    cache_size включает LRU-кэш оценок (sw_optimizer.cache) на столько
+    позиций: кандидаты, совпадающие с уже оценёнными (точно или после
+    округления до cache_decimals знаков), не отдаются на оценку. neval
+    считает только настоящие вызовы целевой функции.
+
+    recorder - вызываемый объект (например, telemetry.JsonlRecorder),
+    который после каждой итерации получает словарь со стратегией, временем
+    фаз (генерация случайных чисел, обновление, ограничение границами,
+    оценка), скоростью оценок, долей принятых кандидатов, разнообразием
+    популяции и её размером. Без recorder замеры не выполняются.
 
-def swo(search_agents_no, Tmax, ub=None, lb=None, dim=None, fobj=None, tol=1e-10, max_stall=300):
-    # Устанавливаем границы поиска, если они не заданы
-    if ub is None:
-        ub = 512 * np.ones(dim)
-    if lb is None:
-        lb = -512 * np.ones(dim)
+    reduction задаёт уменьшение популяции от search_agents_no до N_min:
+    "recurrent" (исходная рекуррентная формула SWO, быстро сходится к N_min),
+    "linear" (линейно к концу запуска), "nonlinear" (NLPSR, быстрее в
+    начале) или "off". При уменьшении удаляются худшие агенты, а массивы
+    Positions и SW_Fit сжимаются, так что число оценок и память реально
+    уменьшаются. "legacy" - прежнее поведение: размер считается по
+    рекуррентной формуле, а хвостовые строки массивов просто не посещаются.
 
-    # Инициализация переменных
-    Best_SW = np.zeros(dim)  # Лучшая позиция (обновляется в процессе)
-    Best_score = np.inf  # Лучшая оценка (обновляется в процессе)
-    Convergence_curve = np.zeros(Tmax)  # Мощность сходимости
-    neval = 0  # Число оценок
-    neval_per_function = {fobj.__name__: 0}  # Число оценок для функции
+    Остановка определяется критериями (sw_optimizer.termination): всегда
+    MaxIterations(Tmax) и Stall(max_stall) (если max_stall не None), плюс
+    критерии из termination. Причина остановки - в stop_reason.
+
+    dtype задаёт тип позиций (по умолчанию float64; float32 вдвое уменьшает
+    память). low_memory=True для engine="loop" не берёт случайные блоки
+    (n, dim) на итерацию, а генерирует векторы агента на месте в заранее
+    выделенных строках, переиспользует буфер кандидата и обновляет Best_SW
+    на месте. Массивы, которые тогда возвращают ask() и result(), - это
+    внутренние буферы, действительные до следующего вызова; траектория
+    отличается от режима по умолчанию (другой порядок случайных чисел).
+
+    prescreen=k (только engine="vectorized") включает предварительный отбор
+    по суррогатной модели (sw_optimizer.surrogate.RBFSurrogate), обученной
+    на архиве всех оценённых точек: на итерации для каждого агента строится
+    k кандидатов, из них берётся лучший по модели, и на настоящую оценку
+    отдаются только кандидаты, которым модель предсказывает улучшение
+    позиции агента (хотя бы один за итерацию). Остальные отвергаются без
+    вызова целевой функции, их число - в screened_out. surrogate_points -
+    число последних точек архива, по которым строится модель.
+    """
 
     TR = 0.5  # Вероятность использования первой стратегии
     Cr = 0.3  # Вероятность кроссовера
     N_min = 20  # Минимальное количество агентов
+    explore = 0.1  # Доля кандидатов, оцениваемых вопреки прогнозу модели (prescreen)
 
-    # Инициализация позиций агентов
-    Positions = initialize_positions(search_agents_no, dim, ub, lb)
-    # Оценка для каждой позиции
-    SW_Fit = np.array([fobj(Positions[i]) for i in range(search_agents_no)])
-    neval += search_agents_no
-    neval_per_function[fobj.__name__] += search_agents_no
+    def __init__(self, search_agents_no, Tmax, ub=None, lb=None, dim=None, tol=1e-10, max_stall=300, engine='loop',
+                 seed=None, name='fobj', cache_size=None, cache_decimals=None, recorder=None, reduction='recurrent',
+                 termination=None, dtype=None, low_memory=False, prescreen=None, surrogate_points=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        if reduction not in REDUCTIONS:
+            raise ValueError(f"Unknown reduction {reduction!r}, expected one of {REDUCTIONS}")
+        if prescreen is not None and engine != 'vectorized':
+            raise ValueError("Surrogate pre-screening (prescreen) requires engine='vectorized'")
+        if prescreen is not None and prescreen < 1:
+            raise ValueError("prescreen must be at least 1")
 
-    # Инициализация лучшей позиции и лучшей оценки после первой итерации
-    Best_score = np.min(SW_Fit)
-    Best_SW = Positions[np.argmin(SW_Fit)].copy()
+        # Устанавливаем границы поиска, если они не заданы
+        if ub is None:
+            ub = 512 * np.ones(dim)
+        if lb is None:
+            lb = -512 * np.ones(dim)
+        self.dtype = np.dtype(dtype or float)
+        self.low_memory = low_memory
+        self.ub = np.asarray(ub, dtype=self.dtype)
+        self.lb = np.asarray(lb, dtype=self.dtype)
+        self.dim = dim
+        self.Tmax = Tmax
+        self.tol = tol
+        self.max_stall = max_stall
+        self.engine = engine
+        self.reduction = reduction
+        self.N_init = search_agents_no
+        self.N_min = min(self.N_min, search_agents_no)
+        self.rng = np.random.default_rng(seed)
 
-    t = 0
-    stall_count = 0
-    prev_best_score = Best_score
+        # Инициализация переменных
+        self.search_agents_no = search_agents_no
+        self.Positions = None
+        self.SW_Fit = None
+        self.Best_SW = np.zeros(dim, dtype=self.dtype)  # Лучшая позиция (обновляется в процессе)
+        self.Best_score = np.inf  # Лучшая оценка (обновляется в процессе)
+        self.Convergence_curve = np.zeros(Tmax)  # Мощность сходимости
+        self.neval = 0  # Число оценок
+        self.name = name
+        self.neval_per_function = {name: 0}  # Число оценок для функции
+        self.t = 0
+        self.stall_count = 0
+        self.prev_best_score = np.inf
 
-    # Основной цикл
-    while t < Tmax and stall_count < max_stall:
-        # Динамическое изменение параметра а
-        a = 2 - 2 * (t / Tmax)
-        a2 = -1 - 1 * (t / Tmax)
-        k = 1 - t / Tmax
-        JK = np.random.permutation(search_agents_no)
-
-        # Если выбирается первая стратегия охоты
-        if np.random.rand() < TR:
-            for i in range(search_agents_no):
-                r1, r2, r3, p = np.random.rand(4)
-                C = a * (2 * r1 - 1)  # Коэффициент, влияющий на изменение позиции
-                l = (a2 - 1) * np.random.rand() + 1  # Леви-флайт коэффициент
-                L = levy_flight(dim)  # Применение Леви-Полета для случайных шагов
-                vc = np.random.uniform(-k, k, dim)  # Вектор случайных изменений
-                rn1 = np.random.randn()  # Случайное нормальное число
-                O_P = Positions[i].copy()  # Сохранение старой позиции
-
-                # Обновление позиции агента с применением первой стратегии охоты
-                for j in range(dim):
-                    if i < k * search_agents_no:  # Агент с различными стратегиями
-                        if p < (1 - t / Tmax):  # Если агент использует охоту
-                            if r1 < r2:  # Охота по принципу "погоня"
-                                m1 = abs(rn1) * r1
-                                Positions[i, j] += m1 * (Positions[JK[1], j] - Positions[JK[2], j])  # Погоня за жертвой
-                            else:  # Взаимодействие с окружающей средой
-                                B = 1 / (1 + np.exp(l))  # Элемент взаимодействия
-                                m2 = B * np.cos(l * 2 * np.pi)
-                                Positions[i, j] = Positions[JK[i], j] + m2 * (lb[j] + np.random.rand() * (ub[j] - lb[j]))
-                        else:  # Агент использует другой способ обновления
-                            if r1 < r2:
-                                Positions[i, j] += C * abs(2 * np.random.rand() * Positions[JK[3], j] - Positions[i, j])
-                            else:
-                                Positions[i, j] *= vc[j]
-                    else:  # Обновление для агентов, находящихся ближе к лучшему решению
-                        if r1 < r2:
-                            Positions[i, j] = Best_SW[j] + np.cos(2 * l * np.pi) * (Best_SW[j] - Positions[i, j])
-                        else:
-                            Positions[i, j] = Positions[JK[1], j] + r3 * abs(L[j]) * (Positions[JK[1], j] - Positions[i, j]) + (1 - r3) * (np.random.rand() > np.random.rand()) * (Positions[JK[3], j] - Positions[JK[2], j])
-
-                # Применение границ для позиции агента
-                Positions[i] = np.clip(Positions[i], lb, ub)
-                # Оценка позиции агента
-                SW_Fit1 = fobj(Positions[i])
-                neval += 1
-                neval_per_function[fobj.__name__] += 1
-
-                # Если новая позиция лучше, обновляем лучшую позицию
-                if SW_Fit1 < SW_Fit[i]:
-                    SW_Fit[i] = SW_Fit1
-                    if SW_Fit1 < Best_score:
-                        Best_score = SW_Fit1
-                        Best_SW = Positions[i].copy()
-                else:
-                    Positions[i] = O_P  # Возвращаем прежнюю позицию, если результат хуже
+        self.cache = EvaluationCache(cache_size, cache_decimals) if cache_size else None
+        self._pending = None  # Кандидаты последнего ask(), ждущие tell()
+        self._agent = 0  # Текущий агент итерации (engine="loop")
+        self._scratch = None  # Рабочие строки размера dim (engine="loop")
+        self._X = np.empty(dim, dtype=self.dtype) if low_memory else None  # Буфер кандидата
+        self.hunting = None
+
+        self.termination = [MaxIterations(Tmax)] + ([Stall(max_stall)] if max_stall is not None else [])
+        self.termination += list(termination or [])
+        self.stop_reason = None
+        self.start_time = None
+        self._miss = None
+
+        self.prescreen = prescreen
+        self.surrogate = RBFSurrogate(self.lb, self.ub, surrogate_points) if prescreen else None
+        self.screened_out = 0  # Кандидаты, отвергнутые по предсказанию модели без оценки
+        self._predicted = None  # Предсказанные оценки кандидатов последнего ask()
+
+        self.recorder = recorder
+        if recorder is not None:
+            self._phases = dict.fromkeys(PHASES, 0.0)
+            self.rng = TimedGenerator(self.rng, self._phases)
+            self._iteration_start = time.perf_counter()
+            self._accepted = 0
+            self._candidates = 0
+            self._neval_start = 0
+
+    @property
+    def initialized(self):
+        return self.SW_Fit is not None
+
+    @property
+    def done(self):
+        return self.stop_reason is not None
+
+    def ask(self):
+        """Возвращает матрицу (n, dim) позиций, которые нужно оценить.
+
+        С кэшем оценок возвращаются только позиции, которых нет в кэше;
+        кандидаты, которые все нашлись в кэше, применяются сразу. Если при
+        этом закончилась итерация (или вся оптимизация), возвращается пустая
+        матрица (её всё равно нужно передать в tell()), так что каждая
+        итерация завершается ровно одной парой ask()/tell().
+        """
+        if self._pending is not None:
+            raise RuntimeError("ask() called twice without tell()")
+        if self.done:
+            raise RuntimeError("Optimization has finished")
+        if self.start_time is None:
+            self.start_time = time.monotonic()
 
-        # Если выбирается вторая стратегия спаривания
+        while True:
+            if self.recorder is None:
+                candidates = self._next_candidates()
+            else:
+                start = time.perf_counter()
+                candidates = self._next_candidates()
+                self._phases['update'] += time.perf_counter() - start
+                self._asked_at = time.perf_counter()
+            fitness, miss = self._lookup(candidates)
+            if miss is None:
+                self._pending = candidates
+                return candidates
+            if miss.any():
+                self._pending, self._cached, self._miss = candidates, fitness, miss
+                return candidates[miss]
+            t = self.t
+            self._apply(candidates, fitness)
+            if self.done or self.t != t:
+                self._pending, self._cached, self._miss = candidates[:0], fitness[:0], miss[:0]
+                return self._pending
+
+    def tell(self, fitness):
+        """Принимает значения целевой функции для позиций последнего ask()."""
+        if self._pending is None:
+            raise RuntimeError("tell() called without a pending ask()")
+        candidates, self._pending = self._pending, None
+        if self.recorder is not None:
+            self._phases['evaluation'] += time.perf_counter() - self._asked_at
+        if self._miss is None:
+            fitness = np.asarray(fitness, dtype=float).reshape(len(candidates))
+            evaluated = len(candidates)
+            if self.surrogate is not None:
+                self.surrogate.add(candidates, fitness)
+        else:
+            # Дополняем значения из кэша (и отвергнутые сверх бюджета) только что вычисленными
+            miss, self._miss = self._miss, None
+            evaluated = int(miss.sum())
+            new_fitness = np.asarray(fitness, dtype=float).reshape(evaluated)
+            if self.cache is not None:
+                self.cache.store(candidates[miss], new_fitness)
+            if self.surrogate is not None:
+                self.surrogate.add(candidates[miss], new_fitness)
+            fitness = self._cached
+            fitness[miss] = new_fitness
+        self.neval += evaluated
+        self.neval_per_function[self.name] += evaluated
+        if len(candidates):
+            self._apply(candidates, fitness)
+
+    def _lookup(self, candidates):
+        """Значения кандидатов, которые не нужно оценивать, и маска тех, что нужно.
+
+        Возвращает (None, None), если оценивать нужно всех кандидатов.
+        """
+        budget = None
+        for criterion in self.termination:
+            if isinstance(criterion, MaxEvaluations):
+                remaining = criterion.remaining(self)
+                budget = remaining if budget is None else min(budget, remaining)
+        predicted, self._predicted = self._predicted, None
+        if self.cache is None and predicted is None and (budget is None or budget >= len(candidates)):
+            return None, None
+
+        if self.cache is not None:
+            fitness, miss = self.cache.lookup(candidates)
+        else:
+            fitness = np.full(len(candidates), np.nan)
+            miss = np.ones(len(candidates), dtype=bool)
+        if predicted is not None and miss.any():
+            # Оцениваются только кандидаты, которым модель предсказывает улучшение;
+            # если таких нет - один с наибольшим предсказанным выигрышем
+            gain = predicted - self.SW_Fit[:len(candidates)]
+            promising = miss & ((gain < 0) | (self.rng.random(len(candidates)) < self.explore))
+            if not promising.any():
+                promising[np.flatnonzero(miss)[np.argmin(gain[miss])]] = True
+            skip = miss & ~promising
+            fitness[skip] = np.inf
+            miss = promising
+            self.screened_out += int(skip.sum())
+            if self.cache is not None:
+                self.cache.misses -= int(skip.sum())
+        if budget is not None and miss.sum() > budget:
+            # Кандидаты сверх бюджета оценок не оцениваются и отвергаются
+            skip = np.flatnonzero(miss)[budget:]
+            fitness[skip] = np.inf
+            miss[skip] = False
+            if self.cache is not None:
+                self.cache.misses -= len(skip)
+        return fitness, miss
+
+    def _check_termination(self, per_iteration):
+        for criterion in self.termination:
+            if (per_iteration or criterion.per_evaluation) and criterion(self):
+                self.stop_reason = criterion.reason
+                return
+
+    def _next_candidates(self):
+        if not self.initialized:
+            # Инициализация позиций агентов
+            self.Positions = initialize_positions(self.search_agents_no, self.dim, self.ub, self.lb, self.rng,
+                                                  self.dtype)
+            return self.Positions if self.low_memory else self.Positions.copy()
+        if self._agent == 0:
+            self._begin_iteration()
+        if self.engine == 'vectorized':
+            return self._vectorized_candidates()
+        if self.hunting:
+            return self._hunting_candidate(self._agent)[None, :]
+        return self._mating_candidate(self._agent)[None, :]
+
+    def _apply(self, candidates, fitness):
+        """Жадный отбор для оценённых кандидатов."""
+        if not self.initialized:
+            # Инициализация лучшей позиции и лучшей оценки после первой итерации
+            self.SW_Fit = fitness
+            self.Best_score = np.min(fitness)
+            self.Best_SW = self.Positions[np.argmin(fitness)].copy()
+            self.prev_best_score = self.Best_score
+            if self.recorder is not None:
+                self._reset_telemetry()
+            self._check_termination(per_iteration=False)
+            return
+
+        if self.engine == 'vectorized':
+            n = self.search_agents_no
+            # Жадный отбор: принимаем только улучшившиеся позиции
+            improved = fitness < self.SW_Fit[:n]
+            if self.recorder is not None:
+                self._accepted += int(improved.sum())
+                self._candidates += n
+            if improved.any():
+                self.Positions[:n][improved] = candidates[improved]
+                self.SW_Fit[:n][improved] = fitness[improved]
+                i = np.argmin(np.where(improved, fitness, np.inf))
+                if fitness[i] < self.Best_score:
+                    self._set_best(fitness[i], candidates[i])
+            self._end_iteration()
         else:
-            for i in range(search_agents_no):
-                l = (a2 - 1) * np.random.rand() + 1  # Модификация для спаривания
-                SW_m = np.zeros(dim)
-                O_P = Positions[i].copy()
-
-                # Разница между лучшими и текущими агентами
-                v1 = Positions[JK[1]] - Positions[i] if SW_Fit[JK[1]] < SW_Fit[i] else Positions[i] - Positions[JK[1]]
-                v2 = Positions[JK[2]] - Positions[JK[3]] if SW_Fit[JK[2]] < SW_Fit[JK[3]] else Positions[JK[3]] - Positions[JK[2]]
-
-                rn1, rn2 = np.random.randn(2)  # Случайные нормальные числа
-
-                # Спаривание агентов для обмена информацией
-                for j in range(dim):
-                    SW_m[j] = Positions[i, j] + (np.exp(l)) * abs(rn1) * v1[j] + (1 - np.exp(l)) * abs(rn2) * v2[j]
-                    # Применение кроссовера
-                    if np.random.rand() < Cr:
-                        Positions[i, j] = SW_m[j]
-
-                # Применение границ для позиции агента
-                Positions[i] = np.clip(Positions[i], lb, ub)
-                # Оценка позиции агента
-                SW_Fit1 = fobj(Positions[i])
-                neval += 1
-                neval_per_function[fobj.__name__] += 1
-
-                # Если новая позиция лучше, обновляем лучшую позицию
-                if SW_Fit1 < SW_Fit[i]:
-                    SW_Fit[i] = SW_Fit1
-                    if SW_Fit1 < Best_score:
-                        Best_score = SW_Fit1
-                        Best_SW = Positions[i].copy()
+            i = self._agent
+            # Если новая позиция лучше, обновляем лучшую позицию
+            if self.recorder is not None:
+                self._accepted += bool(fitness[0] < self.SW_Fit[i])
+                self._candidates += 1
+            if fitness[0] < self.SW_Fit[i]:
+                self.Positions[i] = candidates[0]
+                self.SW_Fit[i] = fitness[0]
+                if fitness[0] < self.Best_score:
+                    self._set_best(fitness[0], candidates[0])
+            self._agent += 1
+            if self._agent < self.search_agents_no:
+                self._check_termination(per_iteration=False)
+            if self._agent == self.search_agents_no or self.done:
+                # Остановка посреди итерации закрывает её как неполную
+                self._agent = 0
+                self._end_iteration()
+
+    def _set_best(self, score, position):
+        self.Best_score = score
+        if self.low_memory:
+            self.Best_SW[...] = position
+        else:
+            self.Best_SW = position.copy()
+
+    def iterate(self, fobj):
+        """Цикл ask/evaluate/tell, выдающий IterationState после каждой итерации."""
+        while not self.done:
+            t = self.t
+            positions = self.ask()
+            self.tell(evaluate_population(fobj, positions) if len(positions) else positions[:, 0])
+            if self.t != t:
+                yield IterationState(self.t, self.Best_score, self.Best_SW, self.neval, self.search_agents_no,
+                                     self.hunting)
+
+    def result(self):
+        """Результат в формате swo(): (Best_score, Best_SW, Convergence_curve, neval, neval_per_function)."""
+        return self.Best_score, self.Best_SW, self.Convergence_curve[:self.t], self.neval, self.neval_per_function
+
+    def emigrants(self, k):
+        """Позиции и оценки k лучших агентов (для обмена между островами)."""
+        best = np.argsort(self.SW_Fit, kind='stable')[:k]
+        return self.Positions[best].copy(), self.SW_Fit[best].copy()
+
+    def immigrate(self, positions, fitness):
+        """Заменяет худших агентов уже оценёнными пришельцами, если те лучше.
+
+        Вызывается только между итерациями; neval не меняется.
+        """
+        if self._pending is not None or self._agent != 0:
+            raise RuntimeError("Migration is only possible between iterations")
+        positions = np.asarray(positions, dtype=self.dtype).reshape(-1, self.dim)
+        fitness = np.asarray(fitness, dtype=float).reshape(len(positions))
+        order = np.argsort(fitness, kind='stable')[:self.search_agents_no]
+        worst = np.argsort(self.SW_Fit, kind='stable')[::-1][:len(order)]
+        better = fitness[order] < self.SW_Fit[worst]
+        self.Positions[worst[better]] = positions[order[better]]
+        self.SW_Fit[worst[better]] = fitness[order[better]]
+        if len(order) and fitness[order[0]] < self.Best_score:
+            self._set_best(fitness[order[0]], positions[order[0]])
+
+    def save_checkpoint(self, path):
+        """Сохраняет состояние между итерациями (см. sw_optimizer.checkpoint)."""
+        if self._pending is not None or self._agent != 0:
+            raise RuntimeError("Checkpoints can only be written between iterations")
+        from sw_optimizer.checkpoint import save_checkpoint
+        state = {
+            'Positions': self.Positions, 'SW_Fit': self.SW_Fit, 'Best_SW': self.Best_SW,
+            'Convergence_curve': self.Convergence_curve[:self.t], 'Best_score': self.Best_score,
+            'prev_best_score': self.prev_best_score, 't': self.t, 'stall_count': self.stall_count,
+            'search_agents_no': self.search_agents_no, 'neval': self.neval, 'Tmax': self.Tmax, 'dim': self.dim,
+            'neval_per_function': self.neval_per_function,
+        }
+        # Кэш и архив суррогата входят в точку, чтобы продолжение шло так же, как без прерывания
+        if self.cache is not None:
+            state['cache_keys'], state['cache_values'], state['cache_hits'], state['cache_misses'] = self.cache.state()
+        if self.surrogate is not None:
+            state['surrogate_X'], state['surrogate_y'] = self.surrogate.state()
+            state['screened_out'] = self.screened_out
+        save_checkpoint(path, state, self.rng)
+
+    def load_checkpoint(self, path):
+        """Продолжение прерванного запуска из контрольной точки."""
+        from sw_optimizer.checkpoint import load_checkpoint
+        state, self.rng = load_checkpoint(path)
+        if self.recorder is not None:
+            self.rng = TimedGenerator(self.rng, self._phases)
+        if state['dim'] != self.dim or state['Tmax'] != self.Tmax:
+            raise ValueError(f"Checkpoint {path} was written for dim={state['dim']}, Tmax={state['Tmax']}")
+        self.Positions = state['Positions'].astype(self.dtype, copy=False)
+        self.SW_Fit = state['SW_Fit']
+        self.Best_SW = state['Best_SW'].astype(self.dtype, copy=False)
+        self.Best_score = state['Best_score']
+        self.t = state['t']
+        self.Convergence_curve[:self.t] = state['Convergence_curve']
+        self.stall_count = state['stall_count']
+        self.prev_best_score = state['prev_best_score']
+        self.search_agents_no = state['search_agents_no']
+        self.neval = state['neval']
+        self.neval_per_function = state['neval_per_function']
+        if self.cache is not None and 'cache_keys' in state:
+            self.cache.load_state(state['cache_keys'], state['cache_values'], state['cache_hits'],
+                                  state['cache_misses'])
+        if self.surrogate is not None:
+            if 'surrogate_X' in state:
+                self.surrogate.load_state(state['surrogate_X'], state['surrogate_y'])
+                self.screened_out = state['screened_out']
+            else:
+                # Точка записана без суррогата: модель начинается с текущей популяции
+                self.surrogate.add(self.Positions, self.SW_Fit)
+        self._check_termination(per_iteration=True)
+
+    def _begin_iteration(self):
+        n, dim, t, Tmax, rng = self.search_agents_no, self.dim, self.t, self.Tmax, self.rng
+        self.JK = rng.permutation(n)
+        self.hunting = rng.random() < self.TR
+
+        if self.engine != 'loop':
+            return
+        # Случайные числа всей итерации берутся заранее несколькими блоками;
+        # в low_memory заранее берутся только скаляры, векторы - по агенту
+        if self.hunting:
+            k = 1 - t / Tmax
+            self._U = rng.random((n, 5))
+            self._RN = rng.standard_normal(n)
+            if not self.low_memory:
+                self._LF = levy_flight((n, dim), rng, dtype=self.dtype)
+                if self.dtype == np.float64:
+                    self._VC = rng.uniform(-k, k, (n, dim))
                 else:
-                    Positions[i] = O_P  # Возвращаем прежнюю позицию, если результат хуже
+                    self._VC = rng.random((n, dim), dtype=self.dtype)
+                    self._VC *= 2 * k
+                    self._VC -= k
+                self._R = rng.random((n, 3, dim), dtype=self.dtype)
+        else:
+            self._UL = rng.random(n)
+            self._RN = rng.standard_normal((n, 2))
+            if not self.low_memory:
+                self._CR = rng.random((n, dim), dtype=self.dtype)
 
+    def _end_iteration(self):
         # Обновление сходимости
-        t += 1
-        Convergence_curve[t - 1] = Best_score
+        self.t += 1
+        self.Convergence_curve[self.t - 1] = self.Best_score
 
         # Проверка на стагнацию (если изменения в лучшей оценке очень малы)
-        if abs(prev_best_score - Best_score) < tol:
-            stall_count += 1
+        if abs(self.prev_best_score - self.Best_score) < self.tol:
+            self.stall_count += 1
         else:
-            stall_count = 0
+            self.stall_count = 0
+
+        self.prev_best_score = self.Best_score
 
-        prev_best_score = Best_score
+        if self.recorder is not None:
+            self._record()
 
+        self._reduce_population()
+        if not self.done:
+            self._check_termination(per_iteration=True)
+
+    def _reduce_population(self):
         # Адаптивное уменьшение количества агентов
-        search_agents_no = max(N_min, int(N_min + (search_agents_no - N_min) * ((Tmax - t) / Tmax)))
+        n = reduced_size(self.reduction, self.search_agents_no, self.N_init, self.N_min, self.t, self.Tmax)
+        if self.reduction == 'legacy':
+            self.search_agents_no = n
+            return
+        if n < self.search_agents_no:
+            # Оставляем n лучших агентов в прежнем порядке и сжимаем массивы
+            keep = np.sort(np.argsort(self.SW_Fit, kind='stable')[:n])
+            self.Positions = self.Positions[keep]
+            self.SW_Fit = self.SW_Fit[keep]
+            self.search_agents_no = n
+
+    def _reset_telemetry(self):
+        for phase in PHASES:
+            self._phases[phase] = 0.0
+        self._accepted = 0
+        self._candidates = 0
+        self._neval_start = self.neval
+        self._iteration_start = time.perf_counter()
+
+    def _record(self):
+        phases = self._phases
+        n = self.search_agents_no
+        # Время генерации кандидатов включает случайные числа и ограничение границами
+        update = phases['update'] - phases['rng'] - phases['clip']
+        total = time.perf_counter() - self._iteration_start
+        self.recorder({
+            't': self.t,
+            'strategy': 'hunting' if self.hunting else 'mating',
+            'search_agents_no': n,
+            'best_score': float(self.Best_score),
+            'neval': self.neval,
+            'time_rng': phases['rng'],
+            'time_update': update,
+            'time_clip': phases['clip'],
+            'time_evaluation': phases['evaluation'],
+            'time_total': total,
+            'evaluations': self.neval - self._neval_start,
+            'evals_per_second': ((self.neval - self._neval_start) / phases['evaluation']
+                                 if phases['evaluation'] > 0 else None),
+            'acceptance_rate': self._accepted / self._candidates if self._candidates else 0.0,
+            'diversity': float(np.mean(np.std(self.Positions[:n], axis=0))),
+        })
+        self._reset_telemetry()
+
+    def _clip(self, X):
+        if self.recorder is None:
+            return np.clip(X, self.lb, self.ub, out=X)
+        start = time.perf_counter()
+        np.clip(X, self.lb, self.ub, out=X)
+        self._phases['clip'] += time.perf_counter() - start
+        return X
+
+    def _vectorized_candidates(self):
+        if self.surrogate is None or not self.surrogate.ready:
+            return self._population_candidates()
+        # prescreen наборов кандидатов; каждому агенту - лучший по модели
+        n = self.search_agents_no
+        sets = np.stack([self._population_candidates() for _ in range(self.prescreen)])
+        predicted = self.surrogate.predict(sets.reshape(-1, self.dim)).reshape(self.prescreen, n)
+        best = np.argmin(predicted, axis=0)
+        agents = np.arange(n)
+        self._predicted = predicted[best, agents]
+        return sets[best, agents]
+
+    def _population_candidates(self):
+        n = self.search_agents_no
+        if self.hunting:
+            New = _hunting_candidates(self.Positions[:n], self.Best_SW, self.JK, self.t, self.Tmax, self.lb, self.ub,
+                                      self.rng)
+        else:
+            New = _mating_candidates(self.Positions[:n], self.SW_Fit[:n], self.JK, self.t, self.Tmax, self.Cr,
+                                     self.rng)
+        # Применение границ для всей популяции
+        return self._clip(New.astype(self.dtype, copy=False))
+
+    def _candidate_buffers(self, i):
+        """Кандидат X (копия Positions[i]) и рабочие строки S, W для агента i (engine="loop")."""
+        if self._scratch is None:
+            rows = 5 if self.low_memory else 2
+            self._scratch = np.empty((rows, self.dim), dtype=self.dtype)
+        S, W = self._scratch[0], self._scratch[1]
+        if self.low_memory:
+            X = self._X
+            np.copyto(X, self.Positions[i])
+        else:
+            X = self.Positions[i].copy()  # Кандидат; старая позиция остаётся в Positions[i]
+        return X, S, W
+
+    def _hunting_candidate(self, i):
+        """Первая стратегия охоты для агента i (engine="loop").
+
+        Ветвь выбирается один раз на агента, обновление всех координат
+        делается векторно и на месте в буферах S и W.
+        """
+        Positions, Best_SW, JK, lb, ub = self.Positions, self.Best_SW, self.JK, self.lb, self.ub
+        t, Tmax, search_agents_no = self.t, self.Tmax, self.search_agents_no
+        # Динамическое изменение параметра а
+        a = 2 - 2 * (t / Tmax)
+        a2 = -1 - 1 * (t / Tmax)
+        k = 1 - t / Tmax
+
+        # Скаляры - числа Python, чтобы операции с float32-строками оставались в float32
+        r1, r2, r3, p, rl = self._U[i].tolist()
+        C = a * (2 * r1 - 1)  # Коэффициент, влияющий на изменение позиции
+        l = (a2 - 1) * rl + 1  # Леви-флайт коэффициент
+        rn1 = float(self._RN[i])  # Случайное нормальное число
+        X, S, W = self._candidate_buffers(i)
+
+        # Обновление позиции агента с применением первой стратегии охоты
+        if i < k * search_agents_no:  # Агент с различными стратегиями
+            if p < (1 - t / Tmax):  # Если агент использует охоту
+                if r1 < r2:  # Охота по принципу "погоня"
+                    m1 = abs(rn1) * r1
+                    np.subtract(Positions[JK[1]], Positions[JK[2]], out=S)
+                    S *= m1
+                    X += S  # Погоня за жертвой
+                else:  # Взаимодействие с окружающей средой
+                    R = self._uniform_row(i, 0)
+                    B = 1 / (1 + np.exp(l))  # Элемент взаимодействия
+                    m2 = float(B * np.cos(l * 2 * np.pi))
+                    np.subtract(ub, lb, out=S)
+                    S *= R
+                    S += lb
+                    S *= m2
+                    np.add(Positions[JK[i]], S, out=X)
+            else:  # Агент использует другой способ обновления
+                if r1 < r2:
+                    R = self._uniform_row(i, 0)
+                    np.multiply(R, 2, out=S)
+                    S *= Positions[JK[3]]
+                    S -= X
+                    np.abs(S, out=S)
+                    S *= C
+                    X += S
+                else:
+                    X *= self._vc_row(i, k)  # Вектор случайных изменений
+        else:  # Обновление для агентов, находящихся ближе к лучшему решению
+            if r1 < r2:
+                np.subtract(Best_SW, X, out=S)
+                S *= float(np.cos(2 * l * np.pi))
+                np.add(Best_SW, S, out=X)
+            else:
+                L = self._levy_row(i)  # Применение Леви-Полета для случайных шагов
+                np.abs(L, out=S)
+                S *= r3
+                np.subtract(Positions[JK[1]], X, out=W)
+                S *= W
+                S += Positions[JK[1]]
+                W[...] = self._uniform_row(i, 1) > self._uniform_row(i, 2)
+                W *= 1 - r3
+                np.subtract(Positions[JK[3]], Positions[JK[2]], out=X)
+                X *= W
+                X += S
+
+        # Применение границ для позиции агента
+        return self._clip(X)
+
+    def _uniform_row(self, i, r):
+        """Строка r равномерных чисел агента i: из блока итерации или (low_memory) новая."""
+        if not self.low_memory:
+            return self._R[i, r]
+        return self.rng.random(dtype=self.dtype, out=self._scratch[2 + r])
+
+    def _vc_row(self, i, k):
+        if not self.low_memory:
+            return self._VC[i]
+        row = self._scratch[2]
+        self.rng.random(dtype=self.dtype, out=row)
+        row *= 2 * k
+        row -= k
+        return row
+
+    def _levy_row(self, i):
+        if not self.low_memory:
+            return self._LF[i]
+        # Шаг используется сразу, поэтому строки 2 и 3 потом снова свободны
+        return levy_flight(None, self.rng, out=self._scratch[2], work=self._scratch[3])
+
+    def _mating_candidate(self, i):
+        """Вторая стратегия спаривания для агента i (engine="loop")."""
+        Positions, SW_Fit, JK = self.Positions, self.SW_Fit, self.JK
+        a2 = -1 - 1 * (self.t / self.Tmax)
+
+        l = (a2 - 1) * float(self._UL[i]) + 1  # Модификация для спаривания
+        rn1, rn2 = self._RN[i].tolist()  # Случайные нормальные числа
+        X, S, W = self._candidate_buffers(i)
+
+        # Разница между лучшими и текущими агентами
+        if SW_Fit[JK[1]] < SW_Fit[i]:
+            np.subtract(Positions[JK[1]], Positions[i], out=S)
+        else:
+            np.subtract(Positions[i], Positions[JK[1]], out=S)
+        if SW_Fit[JK[2]] < SW_Fit[JK[3]]:
+            np.subtract(Positions[JK[2]], Positions[JK[3]], out=W)
+        else:
+            np.subtract(Positions[JK[3]], Positions[JK[2]], out=W)
+
+        # Спаривание агентов для обмена информацией: SW_m в S
+        S *= float(np.exp(l)) * abs(rn1)
+        S += Positions[i]
+        W *= (1 - float(np.exp(l))) * abs(rn2)
+        S += W
+        # Применение кроссовера
+        if self.low_memory:
+            CR = self.rng.random(dtype=self.dtype, out=self._scratch[2])
+        else:
+            CR = self._CR[i]
+        np.copyto(X, S, where=CR < self.Cr)
+
+        # Применение границ для позиции агента
+        return self._clip(X)
+
+
+def swo(search_agents_no, Tmax, ub=None, lb=None, dim=None, fobj=None, tol=1e-10, max_stall=300, engine='loop',
+        executor=None, workers=None, seed=None, checkpoint_path=None, checkpoint_every=None,
+        checkpoint_interval=None, resume_from=None, cache_size=None, cache_decimals=None, full_output=False,
+        recorder=None, reduction='recurrent', max_evals=None, max_time=None, target_value=None, target_tol=0.0,
+        termination=None, dtype=None, low_memory=False, prescreen=None, surrogate_points=None, coordinator=None):
+    """Spider Wasp Optimizer.
+
+    Тонкая обёртка над SpiderWaspOptimizer, которая сама оценивает fobj.
+
+    engine="loop" обновляет агентов по одному (каждый следующий агент видит
+    уже принятый ход предыдущего). engine="vectorized" строит кандидатов для
+    всей популяции сразу операциями NumPy над масками, затем оценивает их и
+    применяет тот же жадный отбор (новая позиция принимается, только если
+    она лучше старой).
+
+    Если fobj помечена utils.batch.batch_objective, начальная популяция и
+    (в engine="vectorized") кандидаты каждой итерации оцениваются одним
+    вызовом fobj на матрицу (n_agents, dim).
+
+    executor (готовый пул concurrent.futures) или workers (число процессов
+    собственного ProcessPoolExecutor) включают параллельную оценку кандидатов
+    через разделяемую память (см. sw_optimizer.parallel). Это поколенческий
+    режим, поэтому он требует engine="vectorized".
+
+    coordinator (sw_optimizer.distributed.Coordinator) вместо пула раздаёт
+    кандидатов работникам на других хостах по TCP (тоже только
+    engine="vectorized"); с full_output=True info['workers'] содержит
+    счётчики и пропускную способность каждого работника.
+
+    seed (int, SeedSequence или готовый np.random.Generator) задаёт
+    собственный генератор запуска; глобальное состояние np.random не
+    используется. Случайные числа каждой итерации берутся несколькими
+    крупными блоками, а не поштучно.
+
+    checkpoint_path включает контрольные точки (.npz с состоянием популяции,
+    счётчиками, кривой сходимости, состоянием генератора, содержимым кэша
+    оценок и архивом суррогатной модели): каждые
+    checkpoint_every итераций и/или не реже чем раз в checkpoint_interval
+    секунд (если не задано ни то ни другое - после каждой итерации), а также
+    по завершении. resume_from продолжает запуск из такой точки так, как
+    если бы он не прерывался.
+
+    cache_size/cache_decimals включают кэш оценок (см. SpiderWaspOptimizer).
+    При full_output=True шестым элементом возвращается словарь info со
+    счётчиками кэша cache_hits и cache_misses и причиной остановки stop_reason.
+
+    recorder получает статистику каждой итерации (см. sw_optimizer.telemetry).
+    reduction - расписание уменьшения популяции (см. SpiderWaspOptimizer).
+
+    Кроме Tmax и max_stall запуск останавливают max_evals (бюджет вызовов
+    fobj, соблюдается точно), max_time (секунды) и target_value (лучшая
+    оценка не больше target_value + target_tol); эти условия проверяются
+    после каждой порции оценок. termination - дополнительные критерии из
+    sw_optimizer.termination или функции optimizer -> bool.
+
+    dtype (например, np.float32) и low_memory - режим для очень больших
+    размерностей (см. SpiderWaspOptimizer).
+
+    prescreen и surrogate_points включают предварительный отбор кандидатов
+    по суррогатной модели для дорогих fobj (см. SpiderWaspOptimizer); число
+    отвергнутых без оценки кандидатов - в info['screened_out'].
+    """
+    parallel = executor is not None or workers is not None
+    if parallel and engine != 'vectorized':
+        raise ValueError("Parallel evaluation (executor/workers) requires engine='vectorized'")
+    if coordinator is not None and engine != 'vectorized':
+        raise ValueError("Distributed evaluation (coordinator) requires engine='vectorized'")
+    if coordinator is not None and parallel:
+        raise ValueError("Use either a process pool (executor/workers) or a coordinator, not both")
+
+    optimizer = SpiderWaspOptimizer(search_agents_no, Tmax, ub, lb, dim, tol=tol, max_stall=max_stall, engine=engine,
+                                    seed=seed, name=fobj.__name__, cache_size=cache_size,
+                                    cache_decimals=cache_decimals, recorder=recorder, reduction=reduction,
+                                    termination=build_criteria(max_evals, max_time, target_value, target_tol,
+                                                               termination),
+                                    dtype=dtype, low_memory=low_memory, prescreen=prescreen,
+                                    surrogate_points=surrogate_points)
+    if resume_from is not None:
+        optimizer.load_checkpoint(resume_from)
+
+    # Пул процессов и TCP-координатор импортируются, только когда они нужны:
+    # их модули тянут multiprocessing и concurrent.futures, что заметно
+    # удлиняет импорт sw_optimizer в короткоживущих процессах
+    evaluator = fobj
+    if parallel:
+        from sw_optimizer.parallel import SharedMemoryEvaluator
+        evaluator = SharedMemoryEvaluator(fobj, search_agents_no, dim, executor=executor, max_workers=workers)
+    elif coordinator is not None:
+        from sw_optimizer.distributed import DistributedEvaluator
+        evaluator = DistributedEvaluator(fobj, coordinator)
+
+    every_iteration = checkpoint_every is None and checkpoint_interval is None
+    last_checkpoint = time.monotonic()
+    last_checkpoint_t = optimizer.t
+    try:
+        for state in optimizer.iterate(evaluator):
+            if checkpoint_path is None:
+                continue
+            if (every_iteration or (checkpoint_every is not None and state.t - last_checkpoint_t >= checkpoint_every)
+                    or (checkpoint_interval is not None and time.monotonic() - last_checkpoint >= checkpoint_interval)):
+                optimizer.save_checkpoint(checkpoint_path)
+                last_checkpoint = time.monotonic()
+                last_checkpoint_t = state.t
+    finally:
+        if parallel:
+            evaluator.close()
 
-    return Best_score, Best_SW, Convergence_curve[:t], neval, neval_per_function
+    if checkpoint_path is not None:
+        optimizer.save_checkpoint(checkpoint_path)
+    if full_output:
+        cache = optimizer.cache
+        info = {
+            'cache_hits': cache.hits if cache is not None else 0,
+            'cache_misses': cache.misses if cache is not None else 0,
+            'stop_reason': optimizer.stop_reason,
+            'screened_out': optimizer.screened_out,
+            'workers': coordinator.stats() if coordinator is not None else None,
+        }
+        return optimizer.result() + (info,)
+    return optimizer.result()
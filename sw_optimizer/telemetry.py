@@ -0,0 +1,86 @@
+import json
+import time
+
+# Фазы итерации, время которых измеряется при включённой телеметрии
+PHASES = ('rng', 'update', 'clip', 'evaluation')
+
+
+class TimedGenerator:
+    """Обёртка над np.random.Generator, добавляющая время каждого вызова в phases['rng']."""
+
+    def __init__(self, rng, phases):
+        self.rng = rng
+        self.phases = phases
+
+    def __getattr__(self, name):
+        attr = getattr(self.rng, name)
+        if not callable(attr):
+            return attr
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self.phases['rng'] += time.perf_counter() - start
+        return timed
+
+
+class JsonlRecorder:
+    """Записывает статистику каждой итерации отдельной строкой JSON.
+
+    sink - путь к файлу (открывается на дозапись) или открытый текстовый файл.
+    """
+
+    def __init__(self, sink):
+        self._owns_file = isinstance(sink, str)
+        self.file = open(sink, 'a') if self._owns_file else sink
+
+    def __call__(self, stats):
+        self.file.write(json.dumps(stats) + '\n')
+
+    def close(self):
+        if self._owns_file:
+            self.file.close()
+        else:
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ProfilingRecorder:
+    """Профилирует запуск через cProfile и передаёт статистику итераций дальше.
+
+    Профилирование идёт между __enter__ и __exit__; на выходе профиль
+    сохраняется в path (формат pstats) и, если задано print_top, первые
+    print_top строк печатаются по накопленному времени. Вложенный recorder
+    с методом close() на выходе закрывается.
+    """
+
+    def __init__(self, path, recorder=None, print_top=None):
+        self.path = path
+        self.recorder = recorder
+        self.print_top = print_top
+        import cProfile  # Профилировщик нужен только этому классу; модуль телеметрии импортирует каждый swo()
+        self.profile = cProfile.Profile()
+
+    def __call__(self, stats):
+        if self.recorder is not None:
+            self.recorder(stats)
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        if self.print_top:
+            import pstats
+            pstats.Stats(self.profile).sort_stats('cumulative').print_stats(self.print_top)
+        if hasattr(self.recorder, 'close'):
+            self.recorder.close()
@@ -0,0 +1,105 @@
+import time
+
+
+class Criterion:
+    """Критерий остановки: вызов criterion(optimizer) возвращает True, когда пора остановиться.
+
+    Критерии с per_evaluation=True проверяются после каждой порции оценок
+    (каждого tell()), остальные - только в конце итерации. reason - причина
+    остановки, которую получит optimizer.stop_reason.
+    """
+
+    reason = 'criterion'
+    per_evaluation = False
+
+    def __call__(self, optimizer):
+        raise NotImplementedError
+
+
+class MaxIterations(Criterion):
+    reason = 'max_iterations'
+
+    def __init__(self, Tmax):
+        self.Tmax = Tmax
+
+    def __call__(self, optimizer):
+        return optimizer.t >= self.Tmax
+
+
+class Stall(Criterion):
+    """Прежнее правило: max_stall итераций подряд лучшая оценка менялась меньше чем на tol."""
+
+    reason = 'stall'
+
+    def __init__(self, max_stall):
+        self.max_stall = max_stall
+
+    def __call__(self, optimizer):
+        return optimizer.stall_count >= self.max_stall
+
+
+class MaxEvaluations(Criterion):
+    """Бюджет вызовов целевой функции; кандидаты сверх бюджета не отдаются на оценку."""
+
+    reason = 'max_evals'
+    per_evaluation = True
+
+    def __init__(self, max_evals):
+        self.max_evals = max_evals
+
+    def remaining(self, optimizer):
+        return max(0, self.max_evals - optimizer.neval)
+
+    def __call__(self, optimizer):
+        return optimizer.neval >= self.max_evals
+
+
+class MaxTime(Criterion):
+    """Ограничение по времени в секундах, отсчитываемое от первого ask()."""
+
+    reason = 'max_time'
+    per_evaluation = True
+
+    def __init__(self, max_time):
+        self.max_time = max_time
+
+    def __call__(self, optimizer):
+        return optimizer.start_time is not None and time.monotonic() - optimizer.start_time >= self.max_time
+
+
+class TargetValue(Criterion):
+    """Остановка, как только лучшая оценка не больше target_value + tol."""
+
+    reason = 'target_value'
+    per_evaluation = True
+
+    def __init__(self, target_value, tol=0.0):
+        self.target_value = target_value
+        self.tol = tol
+
+    def __call__(self, optimizer):
+        return optimizer.Best_score <= self.target_value + self.tol
+
+
+class Predicate(Criterion):
+    """Произвольное условие func(optimizer) -> bool."""
+
+    def __init__(self, func, reason='predicate', per_evaluation=False):
+        self.func = func
+        self.reason = reason
+        self.per_evaluation = per_evaluation
+
+    def __call__(self, optimizer):
+        return bool(self.func(optimizer))
+
+
+def build_criteria(max_evals=None, max_time=None, target_value=None, target_tol=0.0, termination=None):
+    """Список критериев из параметров swo(); вызываемые объекты в termination оборачиваются в Predicate."""
+    criteria = [c if isinstance(c, Criterion) else Predicate(c) for c in (termination or [])]
+    if max_evals is not None:
+        criteria.append(MaxEvaluations(max_evals))
+    if max_time is not None:
+        criteria.append(MaxTime(max_time))
+    if target_value is not None:
+        criteria.append(TargetValue(target_value, target_tol))
+    return criteria
@@ -1,10 +1,14 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def ackley(x):
+    x = np.asarray(x)
     a = 20
     b = 0.2
     c = 2 * np.pi
-    d = len(x)
-    sum1 = -a * np.exp(-b * np.sqrt(np.sum(x**2) / d))
-    sum2 = -np.exp(np.sum(np.cos(c * x)) / d)
+    d = x.shape[-1]
+    sum1 = -a * np.exp(-b * np.sqrt(np.sum(x**2, axis=-1) / d))
+    sum2 = -np.exp(np.sum(np.cos(c * x), axis=-1) / d)
     return a + np.exp(1) + sum1 + sum2
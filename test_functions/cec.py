@@ -0,0 +1,227 @@
+"""Сдвинутые и повёрнутые функции в стиле CEC, гибридные и композиционные функции.
+
+Все функции определены на [-100, 100]^dim, оптимум сдвинут в случайную
+точку, переменные перемешаны случайным ортогональным поворотом. Векторы
+сдвига, матрицы поворота и перестановки строятся один раз на (функцию,
+dim, seed), хранятся как .npy в utils.transforms.TRANSFORM_DIR и
+открываются через mmap_mode, так что параллельные процессы делят одну копию
+страниц вместо того, чтобы строить свою матрицу dim x dim. При pickle
+объект передаёт только параметры и в новом процессе снова открывает файлы.
+
+Все функции - пакетные (utils.batch): матрица (n, dim) оценивается одним
+умножением на матрицу поворота.
+"""
+import math
+
+import numpy as np
+
+from test_functions.registry import get_function
+from test_functions.schwefel_function import schwefel_function
+from utils.transforms import TRANSFORM_DIR, permutation, rotation_matrix, shift_vector
+
+BOUND = 100.0  # Область поиска всех функций набора: [-BOUND, BOUND]^dim
+
+
+def modified_schwefel(z):
+    """Schwefel в версии CEC 2014: координаты вне [-500, 500] отражаются внутрь области.
+
+    За выход из области добавляется штраф (|z_i| - 500)^2 / (10000 dim),
+    иначе после поворота и масштабирования функция уходит ниже своего
+    минимума 0 за границей области.
+    """
+    z = np.asarray(z, dtype=float)
+    outside = np.maximum(np.abs(z) - 500.0, 0.0)
+    mirrored = np.where(outside > 0, np.sign(z) * (500.0 - np.mod(np.abs(z), 500.0)), z)
+    return schwefel_function(mirrored) + np.sum(outside ** 2, axis=-1) / (10000 * z.shape[-1])
+
+
+# Базовые функции, которые вне своей области нужно заменить версией CEC со штрафом
+MODIFIED = {'schwefel_function': modified_schwefel}
+
+
+def _base(name, size):
+    """Базовая функция, масштаб её области на [-BOUND, BOUND] и точка её оптимума размерности size."""
+    spec = get_function(name)
+    scale = max(abs(spec.lb), abs(spec.ub)) / BOUND
+    return MODIFIED.get(name) or spec.load(), scale, spec.optimum_at(size), spec.optimum
+
+
+class ShiftedRotated:
+    """f(x) = g(scale * R (x - o) + x*_g) + bias для базовой функции g из реестра.
+
+    o - вектор сдвига (новая точка оптимума), R - ортогональная матрица
+    (rotate=False - только сдвиг, функция остаётся сепарабельной), scale
+    переводит [-BOUND, BOUND] в естественную область g, x*_g - точка
+    оптимума g. Оптимум: optimum = g(x*_g) + bias в optimum_position = o.
+    """
+
+    batch = True
+
+    def __init__(self, base, dim, seed=0, rotate=True, bias=0.0, name=None, cache_dir=TRANSFORM_DIR):
+        self.base = base
+        self.dim = dim
+        self.seed = seed
+        self.rotate = rotate
+        self.bias = bias
+        self.cache_dir = cache_dir
+        self.__name__ = name or f"{'shifted_rotated' if rotate else 'shifted'}_{base}"
+        self.func, self.scale, self.base_position, base_optimum = _base(base, dim)
+        self.shift = shift_vector(self.__name__, dim, seed, cache_dir=cache_dir)
+        self.rotation = rotation_matrix(self.__name__, dim, seed, cache_dir=cache_dir) if rotate else None
+        self.optimum = base_optimum + bias
+        self.optimum_position = np.array(self.shift)
+
+    def __reduce__(self):
+        return (self.__class__, (self.base, self.dim, self.seed, self.rotate, self.bias, self.__name__,
+                                 self.cache_dir))
+
+    def transform(self, x):
+        z = np.asarray(x, dtype=float) - self.shift
+        if self.rotation is not None:
+            z = z @ self.rotation.T
+        z *= self.scale
+        z += self.base_position
+        return z
+
+    def __call__(self, x):
+        return self.func(self.transform(x)) + self.bias
+
+
+class Hybrid:
+    """Гибридная функция: координаты после сдвига, поворота и перестановки делятся на группы.
+
+    Группа i длины ceil(fractions[i] * dim) (последняя - остаток)
+    оценивается базовой функцией bases[i]; значение - сумма по группам плюс
+    bias. Оптимум bias (сумма оптимумов баз равна нулю) в точке сдвига.
+    """
+
+    batch = True
+
+    def __init__(self, name, bases, fractions, dim, seed=0, bias=0.0, cache_dir=TRANSFORM_DIR):
+        self.__name__ = name
+        self.bases = tuple(bases)
+        self.fractions = tuple(fractions)
+        self.dim = dim
+        self.seed = seed
+        self.bias = bias
+        self.cache_dir = cache_dir
+
+        sizes = [math.ceil(f * dim) for f in fractions[:-1]]
+        sizes.append(dim - sum(sizes))
+        if min(sizes) < 1:
+            raise ValueError(f"{name} needs a larger dim than {dim} to split into {len(bases)} groups")
+        self.segments = []
+        start = 0
+        for base, size in zip(bases, sizes):
+            func, scale, position, optimum = _base(base, size)
+            self.segments.append((func, scale, position, start, start + size))
+            start += size
+        self.shift = shift_vector(name, dim, seed, cache_dir=cache_dir)
+        self.rotation = rotation_matrix(name, dim, seed, cache_dir=cache_dir)
+        self.permutation = permutation(name, dim, seed, cache_dir=cache_dir)
+        self.optimum = bias + sum(_base(base, size)[3] for base, size in zip(bases, sizes))
+        self.optimum_position = np.array(self.shift)
+
+    def __reduce__(self):
+        return (self.__class__, (self.__name__, self.bases, self.fractions, self.dim, self.seed, self.bias,
+                                 self.cache_dir))
+
+    def __call__(self, x):
+        z = ((np.asarray(x, dtype=float) - self.shift) @ self.rotation.T)[..., self.permutation]
+        total = self.bias
+        for func, scale, position, start, stop in self.segments:
+            total = total + func(z[..., start:stop] * scale + position)
+        return total
+
+
+class Composition:
+    """Композиционная функция CEC: взвешенная смесь сдвинутых и повёрнутых функций.
+
+    Вес компоненты i: w_i = exp(-|x - o_i|^2 / (2 dim sigma_i^2)) / |x - o_i|,
+    нормированный по всем компонентам; значение -
+    sum w_i (lambdas[i] * g_i(x) + biases[i]). Глобальный оптимум -
+    оптимум первой компоненты (biases[0] должен быть наименьшим).
+    """
+
+    batch = True
+
+    def __init__(self, name, bases, sigmas, lambdas, biases, dim, seed=0, cache_dir=TRANSFORM_DIR):
+        self.__name__ = name
+        self.bases = tuple(bases)
+        self.sigmas = tuple(sigmas)
+        self.lambdas = tuple(lambdas)
+        self.biases = tuple(biases)
+        self.dim = dim
+        self.seed = seed
+        self.cache_dir = cache_dir
+        self.components = [ShiftedRotated(base, dim, seed, name=f'{name}_{i}_{base}', cache_dir=cache_dir)
+                           for i, base in enumerate(bases)]
+        self.optimum = self.lambdas[0] * self.components[0].optimum + self.biases[0]
+        self.optimum_position = self.components[0].optimum_position
+
+    def __reduce__(self):
+        return (self.__class__, (self.__name__, self.bases, self.sigmas, self.lambdas, self.biases, self.dim,
+                                 self.seed, self.cache_dir))
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=float)
+        weights, values = [], []
+        for component, sigma, lam, bias in zip(self.components, self.sigmas, self.lambdas, self.biases):
+            d2 = np.sum((x - component.shift) ** 2, axis=-1)
+            with np.errstate(divide='ignore'):
+                weights.append(np.exp(-d2 / (2 * self.dim * sigma ** 2)) / np.sqrt(d2))
+            values.append(lam * component(x) + bias)
+        W = np.array(weights)
+        V = np.array(values)
+        # В точке оптимума компоненты её вес бесконечен - берём только её
+        at_optimum = np.isinf(W)
+        W = np.where(at_optimum.any(axis=0), at_optimum, W)
+        total = W.sum(axis=0)
+        # Вдали от всех оптимумов веса обнуляются - тогда компоненты равноправны
+        W = np.where(total > 0, W / np.where(total > 0, total, 1), 1 / len(self.components))
+        return np.sum(W * V, axis=0)
+
+
+def cec_shifted_sphere(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('sphere', dim, seed, rotate=False, name='cec_shifted_sphere', cache_dir=cache_dir)
+
+
+def cec_ackley(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('ackley', dim, seed, name='cec_ackley', cache_dir=cache_dir)
+
+
+def cec_shifted_rastrigin(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('rastrigin', dim, seed, rotate=False, name='cec_shifted_rastrigin', cache_dir=cache_dir)
+
+
+def cec_rastrigin(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('rastrigin', dim, seed, name='cec_rastrigin', cache_dir=cache_dir)
+
+
+def cec_rosenbrock(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('rosenbrock', dim, seed, name='cec_rosenbrock', cache_dir=cache_dir)
+
+
+def cec_schwefel(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return ShiftedRotated('schwefel_function', dim, seed, name='cec_schwefel', cache_dir=cache_dir)
+
+
+def cec_hybrid_1(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return Hybrid('cec_hybrid_1', ('rosenbrock', 'rastrigin', 'sphere'), (0.2, 0.4, 0.4), dim, seed,
+                  cache_dir=cache_dir)
+
+
+def cec_hybrid_2(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return Hybrid('cec_hybrid_2', ('schwefel_function', 'rastrigin', 'ackley'), (0.3, 0.3, 0.4), dim, seed,
+                  cache_dir=cache_dir)
+
+
+def cec_composition_1(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    # lambdas выравнивают порядок значений компонент
+    return Composition('cec_composition_1', ('rastrigin', 'sphere', 'ackley'), (10, 20, 30), (1, 1e-6, 10),
+                       (0, 100, 200), dim, seed, cache_dir=cache_dir)
+
+
+def cec_composition_2(dim, seed=0, cache_dir=TRANSFORM_DIR):
+    return Composition('cec_composition_2', ('schwefel_function', 'rosenbrock', 'rastrigin'), (10, 20, 30),
+                       (0.25, 1e-4, 1), (0, 100, 200), dim, seed, cache_dir=cache_dir)
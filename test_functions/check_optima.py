@@ -0,0 +1,59 @@
+"""Проверка известных оптимумов реестра на случайных точках.
+
+Для каждой функции и каждой подходящей размерности значение в
+optimum_at(dim) должно совпадать с optimum, а равномерные случайные точки
+из области поиска не должны опускаться ниже optimum. Код возврата 1, если
+хотя бы одна проверка не прошла.
+
+Usage:
+    python -m test_functions.check_optima
+    python -m test_functions.check_optima --function cec --dims 2,10,30 --samples 20000
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from test_functions.registry import REGISTRY
+
+TOL = 1e-6  # Допуск на ошибки округления и округлённые точки оптимума
+
+
+def check_optimum(spec, dim, samples, rng):
+    """Минимум f по samples случайным точкам и значение f в точке оптимума."""
+    func = spec.load(dim) if spec.per_dim else spec.load()
+    lb, ub = spec.bounds(dim)
+    X = rng.uniform(lb, ub, (samples, dim))
+    values = func(X) if spec.batch else np.array([func(x) for x in X])
+    return float(np.min(values)), float(func(spec.optimum_at(dim)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that no random sample goes below the registered optimum.')
+    parser.add_argument('--function', default='', help='Only functions whose name starts with this prefix')
+    parser.add_argument('--dims', default='2,10,30', help='Comma-separated dimensions to check')
+    parser.add_argument('--samples', type=int, default=5000, help='Random samples per function and dimension')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    dims = [int(d) for d in args.dims.split(',') if d.strip()]
+    print(f"{'function':<24} {'dim':>4} {'optimum':>12} {'at optimum':>12} {'sample min':>12}")
+    failures = 0
+    for name, spec in REGISTRY.items():
+        if not name.startswith(args.function):
+            continue
+        # Функции фиксированной размерности проверяются в ней
+        for dim in [d for d in dims if spec.supports(d)] or [spec.min_dim]:
+            sample_min, at_optimum = check_optimum(spec, dim, args.samples, rng)
+            failed = sample_min < spec.optimum - TOL or abs(at_optimum - spec.optimum) > TOL
+            failures += failed
+            print(f"{name:<24} {dim:>4} {spec.optimum:>12.6g} {at_optimum:>12.6g} {sample_min:>12.6g}"
+                  f"{' FAILED' if failed else ''}")
+
+    print(f"{failures} failed checks")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,9 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def himmelblau(x):
-    return (x[0]**2 + x[1] - 11)**2 + (x[0] + x[1]**2 - 7)**2
+    x = np.asarray(x)
+    x1, x2 = x[..., 0], x[..., 1]
+    return (x1**2 + x2 - 11)**2 + (x1 + x2**2 - 7)**2
@@ -1,5 +1,9 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def rastrigin(x):
+    x = np.asarray(x)
     A = 10
-    return A * len(x) + sum([(xi**2 - A * np.cos(2 * np.pi * xi)) for xi in x])
+    return A * x.shape[-1] + np.sum(x**2 - A * np.cos(2 * np.pi * x), axis=-1)
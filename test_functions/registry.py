@@ -0,0 +1,128 @@
+"""Реестр тестовых функций: границы, допустимые размерности, известный оптимум.
+
+Модуль функции импортируется только при первом load(), поэтому список
+функций и их метаданные доступны без загрузки самих функций.
+"""
+import importlib
+
+import numpy as np
+
+
+class TestFunction:
+    """Описание тестовой функции.
+
+    lb и ub - числа (одинаковые для всех координат) или кортежи длины
+    max_dim для функций фиксированной размерности. optimum - известное
+    значение глобального минимума, optimum_position - одна из точек минимума
+    (число для всех координат или кортеж), batch - принимает ли функция
+    матрицу (n, dim) (см. utils.batch).
+
+    per_dim=True - функция строится отдельно для каждой размерности (наборы
+    с матрицами поворота, см. test_functions.cec): модуль содержит фабрику
+    name(dim), load(dim) возвращает её результат, а точка оптимума берётся
+    у построенной функции.
+    """
+
+    __test__ = False  # Не тестовый класс для pytest, несмотря на имя
+
+    def __init__(self, name, lb, ub, optimum, optimum_position, min_dim=1, max_dim=None, batch=True,
+                 module=None, per_dim=False):
+        self.name = name
+        self.lb = lb
+        self.ub = ub
+        self.optimum = optimum
+        self.optimum_position = optimum_position
+        self.min_dim = min_dim
+        self.max_dim = max_dim
+        self.batch = batch
+        self.module = module or f'test_functions.{name}'
+        self.per_dim = per_dim
+        self._func = None
+        self._instances = {}  # Построенные функции по размерности (per_dim)
+
+    def __repr__(self):
+        return f'TestFunction({self.name!r})'
+
+    def supports(self, dim):
+        return dim >= self.min_dim and (self.max_dim is None or dim <= self.max_dim)
+
+    @property
+    def dims(self):
+        """Описание допустимых размерностей для сообщений: "2", "2+" и т. п."""
+        if self.max_dim == self.min_dim:
+            return str(self.min_dim)
+        if self.max_dim is None:
+            return f'{self.min_dim}+'
+        return f'{self.min_dim}-{self.max_dim}'
+
+    def check_dim(self, dim):
+        if not self.supports(dim):
+            raise ValueError(f"{self.name} is defined for dim {self.dims}, got dim={dim}")
+
+    def bounds(self, dim):
+        """Массивы (lb, ub) длины dim."""
+        self.check_dim(dim)
+        return (np.broadcast_to(np.asarray(self.lb, dtype=float), (dim,)).copy(),
+                np.broadcast_to(np.asarray(self.ub, dtype=float), (dim,)).copy())
+
+    def optimum_at(self, dim):
+        """Точка известного минимума размерности dim."""
+        self.check_dim(dim)
+        if self.per_dim:
+            return np.array(self.load(dim).optimum_position, dtype=float)
+        return np.broadcast_to(np.asarray(self.optimum_position, dtype=float), (dim,)).copy()
+
+    def load(self, dim=None):
+        """Сама функция; модуль импортируется при первом вызове.
+
+        Для per_dim-функций нужна размерность dim.
+        """
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self.module), self.name)
+        if not self.per_dim:
+            return self._func
+        if dim is None:
+            raise ValueError(f"{self.name} is built per dimension, pass dim to load()")
+        self.check_dim(dim)
+        if dim not in self._instances:
+            self._instances[dim] = self._func(dim)
+        return self._instances[dim]
+
+
+REGISTRY = {f.name: f for f in (
+    TestFunction('ackley', -32.768, 32.768, 0.0, 0.0),
+    TestFunction('bukin_function_n6', (-15.0, -3.0), (-5.0, 3.0), 0.0, (-10.0, 1.0), min_dim=2, max_dim=2),
+    TestFunction('eggholder_function', -512.0, 512.0, -959.6406627, (512.0, 404.2319), min_dim=2, max_dim=2),
+    TestFunction('himmelblau', -5.0, 5.0, 0.0, (3.0, 2.0), min_dim=2, max_dim=2),
+    TestFunction('rastrigin', -5.12, 5.12, 0.0, 0.0),
+    TestFunction('rosenbrock', -5.0, 10.0, 0.0, 1.0, min_dim=2),
+    TestFunction('schwefel_function', -500.0, 500.0, 0.0, 420.9687462275036),
+    TestFunction('sphere', -100.0, 100.0, 0.0, 0.0),
+)}
+
+# Сдвинутые и повёрнутые функции, гибриды и композиции (test_functions.cec)
+REGISTRY.update({f.name: f for f in (
+    TestFunction(name, -100.0, 100.0, 0.0, None, min_dim=min_dim, module='test_functions.cec', per_dim=True)
+    for name, min_dim in (
+        ('cec_shifted_sphere', 1), ('cec_ackley', 1), ('cec_shifted_rastrigin', 1), ('cec_rastrigin', 1),
+        ('cec_rosenbrock', 2), ('cec_schwefel', 1), ('cec_hybrid_1', 10), ('cec_hybrid_2', 10),
+        ('cec_composition_1', 1), ('cec_composition_2', 2),
+    )
+)})
+
+
+def get_function(name):
+    """Описание функции по имени; ValueError со списком известных функций, если такой нет."""
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown test function {name!r}, expected one of {', '.join(REGISTRY)}") from None
+
+
+def function_names(dim=None):
+    """Имена зарегистрированных функций (только допускающих dim, если он задан)."""
+    return [name for name, f in REGISTRY.items() if dim is None or f.supports(dim)]
+
+
+def load_function(name, dim=None):
+    return get_function(name).load(dim)
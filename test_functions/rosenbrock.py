@@ -1,4 +1,8 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def rosenbrock(x):
-    return sum(100 * (x[1:] - x[:-1]**2)**2 + (1 - x[:-1])**2)
+    x = np.asarray(x)
+    return np.sum(100 * (x[..., 1:] - x[..., :-1]**2)**2 + (1 - x[..., :-1])**2, axis=-1)
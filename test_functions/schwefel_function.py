@@ -1,5 +1,9 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def schwefel_function(x):
-    n = len(x)
-    return 418.9829 * n - np.sum(x * np.sin(np.sqrt(np.abs(x))))
+    x = np.asarray(x)
+    n = x.shape[-1]
+    return 418.9828872724338 * n - np.sum(x * np.sin(np.sqrt(np.abs(x))), axis=-1)
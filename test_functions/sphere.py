@@ -1,4 +1,7 @@
 import numpy as np
+from utils.batch import batch_objective
 
+
+@batch_objective
 def sphere(x):
-    return np.sum(x**2)
+    return np.sum(np.asarray(x)**2, axis=-1)
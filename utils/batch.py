@@ -0,0 +1,23 @@
+import numpy as np
+
+
+def batch_objective(func):
+    """Помечает целевую функцию как поддерживающую пакетную оценку.
+
+    Такая функция принимает матрицу позиций формы (n_agents, dim) и
+    возвращает вектор значений формы (n_agents,). Одиночный вектор формы
+    (dim,) она тоже должна принимать, возвращая скаляр.
+    """
+    func.batch = True
+    return func
+
+
+def is_batch(fobj):
+    return getattr(fobj, 'batch', False)
+
+
+def evaluate_population(fobj, positions):
+    """Оценивает всю популяцию: одним вызовом, если fobj пакетная, иначе по строкам."""
+    if is_batch(fobj):
+        return np.asarray(fobj(positions), dtype=float).reshape(len(positions))
+    return np.array([fobj(x) for x in positions], dtype=float)
@@ -0,0 +1,54 @@
+import hashlib
+import os
+
+import numpy as np
+
+from utils.batch import evaluate_population
+
+GRID_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.grid_cache')
+
+
+def _grid_key(func, lb, ub, center, resolution):
+    h = hashlib.sha1()
+    h.update(f'{func.__module__}.{func.__name__}:{resolution}'.encode())
+    # Код функции входит в ключ, чтобы правка функции не оставляла устаревший кэш
+    code = getattr(func, '__code__', None)
+    if code is not None:
+        h.update(code.co_code)
+        h.update(repr(code.co_consts).encode())
+    for arr in (lb[:2], ub[:2], center):
+        h.update(np.asarray(arr, dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+def evaluate_grid(func, lb, ub, dim, resolution=100, center=None, cache_dir=GRID_CACHE_DIR):
+    """Значения func на сетке resolution x resolution по первым двум координатам.
+
+    Остальные координаты фиксированы значениями center (по умолчанию нули).
+    Вся сетка оценивается одним пакетным вызовом (utils.batch), результат
+    кэшируется на диске в cache_dir по ключу (функция, границы, срез,
+    разрешение); cache_dir=None отключает кэш.
+    """
+    center = np.zeros(dim) if center is None else np.asarray(center, dtype=float)
+    x = np.linspace(lb[0], ub[0], resolution)
+    y = np.linspace(lb[1], ub[1], resolution)
+    X, Y = np.meshgrid(x, y)
+
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f'{func.__name__}_{_grid_key(func, lb, ub, center, resolution)}.npy')
+        if os.path.exists(path):
+            return X, Y, np.load(path)
+
+    points = np.tile(center, (X.size, 1))
+    points[:, 0] = X.ravel()
+    points[:, 1] = Y.ravel()
+    Z = evaluate_population(func, points).reshape(X.shape)
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, Z)
+        os.replace(tmp_path, path)
+    return X, Y, Z
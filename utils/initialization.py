@@ -1,5 +1,17 @@
 import numpy as np
 
 
-def initialize_positions(search_agents_no, dim, ub, lb):
-    return np.random.uniform(lb, ub, (search_agents_no, dim))
+def initialize_positions(search_agents_no, dim, ub, lb, rng=None, dtype=None):
+    """Равномерно распределённые начальные позиции (search_agents_no, dim).
+
+    С dtype, отличным от float64 (например, np.float32), числа сразу
+    генерируются в этом типе, без промежуточного массива float64.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if dtype is None or np.dtype(dtype) == np.float64:
+        return rng.uniform(lb, ub, (search_agents_no, dim))
+    positions = rng.random((search_agents_no, dim), dtype=dtype)
+    positions *= np.asarray(ub, dtype=dtype) - np.asarray(lb, dtype=dtype)
+    positions += np.asarray(lb, dtype=dtype)
+    return positions
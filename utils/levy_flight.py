@@ -1,12 +1,58 @@
+import math
+from functools import lru_cache
+
 import numpy as np
-from scipy.special import gamma
 
 
-def levy_flight(d):
-    beta = 3 / 2
-    sigma = (gamma(1 + beta) * np.sin(np.pi * beta / 2) / (gamma((1 + beta) / 2) * beta * 2 ** ((beta - 1) / 2))) ** (
-                1 / beta)
-    u = np.random.randn(d) * sigma
-    v = np.random.randn(d)
-    step = u / np.abs(v) ** (1 / beta)
-    return 0.05 * step
+@lru_cache(maxsize=None)
+def mantegna_sigma(beta):
+    """Масштаб sigma_u алгоритма Мантеньи; считается один раз для каждого beta."""
+    return (math.gamma(1 + beta) * math.sin(math.pi * beta / 2)
+            / (math.gamma((1 + beta) / 2) * beta * 2 ** ((beta - 1) / 2))) ** (1 / beta)
+
+
+class LevyFlight:
+    """Генератор шагов Леви с закэшированной константой sigma.
+
+    Вызов LevyFlight()(size, rng) возвращает блок шагов произвольной формы,
+    например (n_agents, dim), за два обращения к генератору.
+    """
+
+    def __init__(self, beta=3 / 2, scale=0.05):
+        self.beta = beta
+        self.scale = scale
+        self.sigma = mantegna_sigma(beta)
+
+    def __call__(self, size, rng=None, out=None, work=None, dtype=None):
+        """Блок шагов формы size (типа dtype, по умолчанию float64).
+
+        С out (и необязательным work той же формы и типа) шаги пишутся на
+        месте, без временных массивов; size тогда игнорируется.
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if out is None:
+            u = rng.standard_normal(size, dtype=dtype or np.float64) * self.sigma
+            v = rng.standard_normal(size, dtype=dtype or np.float64)
+            if v.dtype != np.float64:
+                # В float32 нормальное число бывает ровно нулём
+                return self.scale * u / np.maximum(np.abs(v), np.finfo(v.dtype).tiny) ** (1 / self.beta)
+            return self.scale * u / np.abs(v) ** (1 / self.beta)
+        if work is None:
+            work = np.empty_like(out)
+        rng.standard_normal(dtype=out.dtype, out=out)
+        rng.standard_normal(dtype=work.dtype, out=work)
+        np.abs(work, out=work)
+        np.maximum(work, np.finfo(work.dtype).tiny, out=work)
+        work **= 1 / self.beta
+        out *= self.scale * self.sigma
+        out /= work
+        return out
+
+
+_default = LevyFlight()
+
+
+def levy_flight(d, rng=None, out=None, work=None, dtype=None):
+    """Шаги Леви (алгоритм Мантеньи, beta = 3/2); d - длина вектора или форма массива шагов."""
+    return _default(d, rng, out, work, dtype)
@@ -0,0 +1,228 @@
+"""Хранилище результатов запусков: только дозапись, полная точность, быстрое чтение.
+
+Каталог хранилища:
+    runs.jsonl     - по строке JSON на запуск: функция, dim, seed, конфигурация,
+                     время, лучшая оценка, neval, причина остановки и
+                     смещения массивов запуска в файлах ниже;
+    solutions.f64  - лучшие позиции всех запусков подряд (float64);
+    curves.f64     - кривые сходимости всех запусков подряд (float64).
+
+Массивы дописываются раньше строки метаданных, поэтому запуск, запись
+которого прервалась, просто не виден: хвост двоичного файла без строки
+никто не адресует, а недописанная последняя строка пропускается. Запись
+идёт под блокировкой файла lock, так что в одно хранилище могут писать
+несколько процессов. load() читает метаданные в столбцы NumPy и открывает
+двоичные файлы через np.memmap - тысячи кривых не копируются в память.
+"""
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results')
+
+RUNS_FILE = 'runs.jsonl'
+SOLUTIONS_FILE = 'solutions.f64'
+CURVES_FILE = 'curves.f64'
+
+# Столбцы RunTable и их типы (object - строки, None и произвольные числа вроде 128-битных seed)
+COLUMNS = {
+    'id': object,
+    'function': object,
+    'dim': int,
+    'seed': object,
+    'best': float,
+    'neval': int,
+    'iterations': int,
+    'elapsed': float,
+    'started': object,
+    'stop_reason': object,
+    'source': object,
+}
+
+
+@contextmanager
+def _locked(path):
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _append_array(path, array):
+    """Дописывает массив float64 в конец файла; возвращает смещение в элементах."""
+    with open(path, 'ab') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end % 8:
+            # Хвост прерванной записи: выравниваем, чтобы файл читался как float64
+            f.write(b'\0' * (8 - end % 8))
+            end += 8 - end % 8
+        f.write(array.tobytes())
+    return end // 8
+
+
+def _open_array(path):
+    size = os.path.getsize(path) // 8 if os.path.exists(path) else 0
+    if size == 0:
+        return np.empty(0)
+    return np.memmap(path, dtype=np.float64, mode='r', shape=(size,))
+
+
+class ResultsStore:
+    """Хранилище запусков в каталоге path (создаётся при первой записи)."""
+
+    def __init__(self, path=RESULTS_DIR):
+        self.path = path
+
+    def append(self, function, dim, best, solution, curve, neval, seed=None, config=None, elapsed=None,
+               stop_reason=None, source=None, **extra):
+        """Дописывает запуск и возвращает его запись метаданных.
+
+        seed - то, из чего можно воспроизвести запуск (целое, например
+        SeedSequence.entropy), config - параметры запуска (агенты, Tmax,
+        engine и т. п.), elapsed - время в секундах; extra попадает в запись
+        как есть и должно сериализоваться в JSON.
+        """
+        solution = np.ascontiguousarray(solution, dtype=np.float64).ravel()
+        curve = np.ascontiguousarray(curve, dtype=np.float64).ravel()
+        record = {
+            'id': uuid.uuid4().hex,
+            'function': function,
+            'dim': int(dim),
+            'seed': int(seed) if seed is not None else None,
+            'best': float(best),
+            'neval': int(neval),
+            'iterations': len(curve),
+            'elapsed': float(elapsed) if elapsed is not None else None,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'stop_reason': stop_reason,
+            'source': source,
+            'config': config or {},
+        }
+        record.update(extra)
+
+        os.makedirs(self.path, exist_ok=True)
+        with _locked(os.path.join(self.path, 'lock')):
+            record['solution'] = [_append_array(os.path.join(self.path, SOLUTIONS_FILE), solution), len(solution)]
+            record['curve'] = [_append_array(os.path.join(self.path, CURVES_FILE), curve), len(curve)]
+            line = (json.dumps(record, default=_json_default) + '\n').encode()
+            with open(os.path.join(self.path, RUNS_FILE), 'a+b') as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        # Недописанная строка прерванной записи остаётся отдельной строкой
+                        line = b'\n' + line
+                f.write(line)
+        return record
+
+    def records(self):
+        """Записи метаданных всех запусков в порядке добавления."""
+        path = os.path.join(self.path, RUNS_FILE)
+        if not os.path.exists(path):
+            return []
+        records = []
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Строка, запись которой прервалась
+                    continue
+        return records
+
+    def load(self, **filters):
+        """Все запуски (или только совпадающие по полям filters, например function="sphere") как RunTable."""
+        records = [r for r in self.records() if all(r.get(k) == v for k, v in filters.items())]
+        return RunTable(records, _open_array(os.path.join(self.path, SOLUTIONS_FILE)),
+                        _open_array(os.path.join(self.path, CURVES_FILE)))
+
+
+class RunTable:
+    """Запуски хранилища в виде столбцов.
+
+    table["best"], table["neval"] и другие поля COLUMNS - массивы NumPy по
+    всем запускам; solution(i) и curve(i) - срезы memmap-файлов без
+    копирования, curves() - матрица кривых для сравнения запусков.
+    """
+
+    def __init__(self, records, solutions, curves):
+        self.records = records
+        self._solutions = solutions
+        self._curves = curves
+        self.columns = {}
+        for name, dtype in COLUMNS.items():
+            values = [r.get(name) for r in records]
+            if dtype is float:
+                values = [np.nan if v is None else v for v in values]
+            column = np.empty(len(values), dtype=dtype)
+            column[:] = values
+            self.columns[name] = column
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, name):
+        if name in self.columns:
+            return self.columns[name]
+        column = np.empty(len(self.records), dtype=object)
+        column[:] = [r.get(name) for r in self.records]
+        return column
+
+    def solution(self, i):
+        offset, size = self.records[i]['solution']
+        return self._solutions[offset:offset + size]
+
+    def curve(self, i):
+        offset, size = self.records[i]['curve']
+        return self._curves[offset:offset + size]
+
+    def curves(self, indices=None):
+        """Матрица (k, L) кривых запусков indices (по умолчанию всех).
+
+        Короткие кривые (остановка раньше Tmax) дополняются последним
+        значением до длины самой длинной.
+        """
+        indices = range(len(self)) if indices is None else indices
+        curves = [self.curve(i) for i in indices]
+        length = max((len(c) for c in curves), default=0)
+        out = np.full((len(curves), length), np.nan)
+        for row, curve in zip(out, curves):
+            if len(curve):
+                row[:len(curve)] = curve
+                row[len(curve):] = curve[-1]
+        return out
+
+    def where(self, **filters):
+        """Индексы запусков, у которых поля равны filters (например function="sphere", dim=10)."""
+        mask = np.ones(len(self), dtype=bool)
+        for name, value in filters.items():
+            mask &= np.array([v == value for v in self[name]], dtype=bool)
+        return np.flatnonzero(mask)
+
+
+def _json_default(value):
+    # Скаляры и массивы NumPy в конфигурации
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,49 @@
+import os
+import zlib
+
+import numpy as np
+
+TRANSFORM_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.transforms')
+
+
+def _rng(name, kind, dim, seed):
+    # Отдельный поток для каждой пары (функция, вид данных), чтобы массивы не зависели друг от друга
+    return np.random.default_rng([seed, dim, zlib.crc32(f'{name}/{kind}'.encode())])
+
+
+def _stored(name, kind, dim, seed, make, cache_dir):
+    """Массив из cache_dir/<name>_D<dim>_s<seed>_<kind>.npy, открытый через mmap_mode='r'.
+
+    Если файла нет, массив строится функцией make(rng) и записывается
+    атомарно (временный файл + os.replace), так что параллельные процессы
+    не видят недописанный файл. cache_dir=None - массив только в памяти.
+    """
+    if cache_dir is None:
+        return make(_rng(name, kind, dim, seed))
+    path = os.path.join(cache_dir, f'{name}_D{dim}_s{seed}_{kind}.npy')
+    if not os.path.exists(path):
+        array = make(_rng(name, kind, dim, seed))
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    return np.load(path, mmap_mode='r')
+
+
+def shift_vector(name, dim, seed=0, bound=80.0, cache_dir=TRANSFORM_DIR):
+    """Вектор сдвига оптимума, равномерный в [-bound, bound]^dim."""
+    return _stored(name, 'shift', dim, seed, lambda rng: rng.uniform(-bound, bound, dim), cache_dir)
+
+
+def rotation_matrix(name, dim, seed=0, cache_dir=TRANSFORM_DIR):
+    """Случайная ортогональная матрица dim x dim (QR гауссовой матрицы с поправкой знаков)."""
+    def make(rng):
+        q, r = np.linalg.qr(rng.standard_normal((dim, dim)))
+        return q * np.sign(np.diag(r))
+    return _stored(name, 'rotation', dim, seed, make, cache_dir)
+
+
+def permutation(name, dim, seed=0, cache_dir=TRANSFORM_DIR):
+    """Случайная перестановка координат (для гибридных функций)."""
+    return _stored(name, 'permutation', dim, seed, lambda rng: rng.permutation(dim), cache_dir)